@@ -0,0 +1,128 @@
+"""Compare the SQLite-backed example tools with rebuilding their data on every call.
+
+The legacy implementations are compiled from the same data as dict literals, exactly as the
+tools used to build them on each call. Both versions are checked for identical output first,
+then timed sequentially and from a thread pool the way the agent dispatches sync tools::
+
+    python benchmarks/datastore.py --calls 20000 --threads 8 --extra-cities 50
+
+``--extra-cities`` adds synthetic cities to both versions to show how each scales with the
+size of the data rather than the size of the answer.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT), str(ROOT / "src")]
+
+import travel_tools  # noqa: E402
+from datastore import ConnectionPool  # noqa: E402
+
+CALLS = [
+    (travel_tools.query_sqlite_hotels, ("New York", "4")),
+    (travel_tools.query_sqlite_hotels, ("London", None)),
+    (travel_tools.query_sqlite_hotels, ("Paris", None)),
+    (travel_tools.query_loyalty_programs, ("New York",)),
+    (travel_tools.query_loyalty_programs, (None,)),
+]
+
+LEGACY_SOURCE = """
+def query_sqlite_hotels(city, rating_min=None):
+    hotels_db = {hotels!r}
+    if city.lower() not in hotels_db:
+        return {{"status": "error", "message": f"No hotel data available for {{city}}"}}
+    results = hotels_db[city.lower()]
+    if rating_min is not None:
+        min_rating = float(rating_min)
+        results = [hotel for hotel in results if hotel["rating"] >= min_rating]
+    return {{"status": "success", "city": city, "hotels": results, "result_count": len(results)}}
+
+
+def query_loyalty_programs(destination=None):
+    user_programs = {programs!r}
+    city_offers = {offers!r}
+    result = {{"loyalty_programs": user_programs, "point_redemption_opportunities": []}}
+    if destination and destination.lower() in city_offers:
+        result["destination_offers"] = city_offers[destination.lower()]
+    if destination and destination.lower() == "new york":
+        result["point_redemption_opportunities"] = {redemptions!r}
+    return result
+"""
+
+
+def add_extra_cities(count: int) -> None:
+    """Add synthetic cities with copies of the New York hotels to the example data."""
+    for i in range(count):
+        travel_tools.HOTELS[f"city {i}"] = [{**hotel, "id": 1000 * (i + 1) + hotel["id"]} for hotel in travel_tools.HOTELS["new york"]]
+
+
+def legacy_tools() -> dict:
+    """Compile the per-call rebuild implementations from the current example data."""
+    namespace: dict = {}
+    source = LEGACY_SOURCE.format(
+        hotels=travel_tools.HOTELS,
+        programs=travel_tools.USER_PROGRAMS,
+        offers=travel_tools.CITY_OFFERS,
+        redemptions=travel_tools.REDEMPTIONS["new york"],
+    )
+    exec(compile(source, "<legacy>", "exec"), namespace)
+    return namespace
+
+
+def run(calls: list, n: int, threads: int) -> float:
+    """Make ``n`` calls round-robin over ``calls`` and return the seconds taken."""
+    work = [calls[i % len(calls)] for i in range(n)]
+    started = time.perf_counter()
+    if threads <= 1:
+        for tool, args in work:
+            tool(*args)
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda call: call[0](*call[1]), work, chunksize=64))
+    return time.perf_counter() - started
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Check both versions agree, then time them.
+
+    Returns:
+        ``0`` on success, ``1`` if the outputs differ.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--calls", type=int, default=20_000, help="Tool calls per measurement (default: 20000)")
+    parser.add_argument("-t", "--threads", type=int, default=8, help="Dispatch threads for the concurrent run (default: 8)")
+    parser.add_argument("--extra-cities", type=int, default=0, help="Synthetic cities added to the data (default: 0)")
+    args = parser.parse_args(argv)
+
+    if args.extra_cities:
+        add_extra_cities(args.extra_cities)
+        travel_tools.travel_db.close()
+        travel_tools.travel_db = ConnectionPool(setup=travel_tools.load_travel_data)
+
+    legacy = legacy_tools()
+    legacy_calls = [(legacy[tool.__name__], call_args) for tool, call_args in CALLS]
+
+    for (tool, call_args), (old, _) in zip(CALLS, legacy_calls, strict=True):
+        if json.dumps(tool(*call_args)) != json.dumps(old(*call_args)):
+            print(f"FAIL: {tool.__name__}{call_args} differs from the per-call rebuild", file=sys.stderr)
+            return 1
+
+    hotels = sum(len(hotels) for hotels in travel_tools.HOTELS.values())
+    print(f"{hotels} hotels in {len(travel_tools.HOTELS)} cities, {args.calls} calls per run")
+    print(f"{'':<12}{'rebuild':>12}{'sqlite':>12}{'speedup':>10}")
+    for label, threads in (("sequential", 1), (f"{args.threads} threads", args.threads)):
+        old = run(legacy_calls, args.calls, threads)
+        new = run(CALLS, args.calls, threads)
+        print(f"{label:<12}{old / args.calls * 1e6:>10.1f}us{new / args.calls * 1e6:>10.1f}us{old / new:>9.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""Peak RSS of many concurrent ``Agent.stream`` sessions collected into response texts.
+
+Each mode runs in a fresh interpreter: ``eager`` formats every tool call as it arrives, like
+the collector did before transcripts, ``annotated`` renders a :class:`events.Transcript` with
+tool annotations and ``plain`` drops tool calls and returns the model text only. The report is
+the growth of peak RSS over the warmed-up interpreter, scaled to 1000 sessions::
+
+    python benchmarks/memory.py --sessions 2000 --fanout 32 -o after.json --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import resource
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable
+
+    from events import Event
+
+MODES = ("eager", "annotated", "plain")
+
+
+async def lookup(city: str, day: str, party: int) -> dict:
+    """Look up availability.
+
+    Args:
+        city: City to search.
+        day: Day of the visit.
+        party: Number of guests.
+    """
+    return {"city": city, "available": True}
+
+
+async def collect_eager(events: AsyncIterable[Event]) -> str:
+    """Join events the way the collector did before transcripts, formatting each call on arrival."""
+    from events import TextDelta, ToolCallStarted
+
+    final_response = []
+    async for event in events:
+        if isinstance(event, TextDelta):
+            final_response.append(event.text)
+        elif isinstance(event, ToolCallStarted):
+            args_str = ", ".join(f"{k}='{v}'" for k, v in event.args.items())
+            final_response.append(f"\n🔧 **Tool**: `{event.name}({args_str})`\n\n")
+    return "".join(final_response).strip()
+
+
+async def child(mode: str, sessions: int, fanout: int, chunks: int) -> dict:
+    """Run ``sessions`` concurrent streams in this interpreter and measure peak RSS growth."""
+    from agent import Agent
+    from events import collect_text
+    from fake_live import CallTools, FakeClient, Text
+
+    calls = [("lookup", {"city": f"City {i}", "day": "Saturday", "party": i % 6 + 1}) for i in range(fanout)]
+    script = [*(Text(f"Chunk {i} of the answer. ") for i in range(chunks)), CallTools(calls), Text("Done.")]
+    agent = Agent(model="fake", client=FakeClient(script, latency=0.01, seed=0))
+    agent.add_tool(lookup)
+
+    async def one(i: int) -> str:
+        events = agent.stream(f"Task {i}")
+        if mode == "eager":
+            return await collect_eager(events)
+        if mode == "plain":
+            return await collect_text(events, annotate_tools=False)
+        return await collect_text(events)
+
+    await one(-1)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    responses = await asyncio.gather(*(one(i) for i in range(sessions)))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    await agent.close()
+    return {
+        "mode": mode,
+        "sessions": sessions,
+        "peak_rss_kb_per_1000": (peak - baseline) * 1000 / sessions,
+        "response_bytes": len(responses[0].encode()),
+    }
+
+
+def run_mode(mode: str, args: argparse.Namespace) -> dict:
+    """Run one mode in a fresh interpreter."""
+    command = [sys.executable, __file__, "--child", mode, "-n", str(args.sessions), "--fanout", str(args.fanout), "--chunks", str(args.chunks)]
+    return json.loads(subprocess.run(command, capture_output=True, text=True, check=True).stdout)
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the selected modes and print their peak RSS per 1000 sessions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-m", "--mode", action="append", choices=MODES, help="Mode to run (default: all)")
+    parser.add_argument("-n", "--sessions", type=int, default=1000, help="Concurrent sessions (default: 1000)")
+    parser.add_argument("--fanout", type=int, default=16, help="Function calls per tool call (default: 16)")
+    parser.add_argument("--chunks", type=int, default=32, help="Text chunks per turn (default: 32)")
+    parser.add_argument("-o", "--output", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(asyncio.run(child(args.child, args.sessions, args.fanout, args.chunks))))
+        return
+
+    baseline = {}
+    if args.compare:
+        baseline = {r["mode"]: r for r in json.loads(Path(args.compare).read_text())["results"]}
+
+    results = []
+    for mode in args.mode or MODES:
+        result = run_mode(mode, args)
+        results.append(result)
+        line = f"{mode:<10} {result['peak_rss_kb_per_1000'] / 1024:8.2f} MiB per 1000 sessions  response {result['response_bytes']} B"
+        if before := baseline.get(mode):
+            line += f"  ({result['peak_rss_kb_per_1000'] / before['peak_rss_kb_per_1000']:.2f}x)"
+        print(line)
+
+    if args.output:
+        meta = {"sessions": args.sessions, "fanout": args.fanout, "chunks": args.chunks}
+        Path(args.output).write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
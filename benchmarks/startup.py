@@ -0,0 +1,93 @@
+"""Cold-start benchmark for ``import agent`` and ``Agent(...)`` construction.
+
+Each sample runs in a fresh interpreter, and the import is reported next to a cold
+``import asyncio`` as a baseline for the machine. The script exits non-zero when either step
+imports the Gemini SDK, and, when budgets are given, when a median time exceeds its budget::
+
+    python benchmarks/startup.py --import-budget-ms 150 --construct-budget-ms 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {src!r})
+started = time.perf_counter()
+import asyncio
+baseline = time.perf_counter()
+import agent
+imported = time.perf_counter()
+instance = agent.Agent(model="gemini-2.0-flash-exp", system_instruction="Be concise.")
+constructed = time.perf_counter()
+print(json.dumps({{
+    "baseline_ms": (baseline - started) * 1000,
+    "import_ms": (imported - baseline) * 1000,
+    "construct_ms": (constructed - imported) * 1000,
+    "sdk_imported": "google.genai" in sys.modules,
+}}))
+"""
+
+
+def sample() -> dict:
+    """Time one cold import and construction in a fresh interpreter."""
+    env = {**os.environ, "GEMINI_API_KEY": os.environ.get("GEMINI_API_KEY", "startup-benchmark")}
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(src=str(ROOT / "src"))],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def _budget(budget_ms: float | None) -> str:
+    return "" if budget_ms is None else f" (budget {budget_ms:g} ms)"
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark and check the SDK stays unimported and any budgets given are met.
+
+    Returns:
+        ``0`` if every check passed, ``1`` otherwise.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--samples", type=int, default=7, help="Fresh interpreters to time (default: 7)")
+    parser.add_argument("--import-budget-ms", type=float, help="Fail when the median `import agent` time exceeds this")
+    parser.add_argument("--construct-budget-ms", type=float, help="Fail when the median `Agent(...)` time exceeds this")
+    args = parser.parse_args(argv)
+
+    samples = [sample() for _ in range(args.samples)]
+    baseline_ms = statistics.median(s["baseline_ms"] for s in samples)
+    import_ms = statistics.median(s["import_ms"] for s in samples)
+    construct_ms = statistics.median(s["construct_ms"] for s in samples)
+    sdk_imported = any(s["sdk_imported"] for s in samples)
+    print(f"import asyncio {baseline_ms:8.2f} ms")
+    print(f"import agent   {import_ms:8.2f} ms ({import_ms / baseline_ms:.1f}x asyncio){_budget(args.import_budget_ms)}")
+    print(f"Agent(...)     {construct_ms:8.2f} ms{_budget(args.construct_budget_ms)}")
+    print(f"SDK imported   {sdk_imported}")
+
+    failures = []
+    if args.import_budget_ms is not None and import_ms > args.import_budget_ms:
+        failures.append("import time over budget")
+    if args.construct_budget_ms is not None and construct_ms > args.construct_budget_ms:
+        failures.append("construction time over budget")
+    if sdk_imported:
+        failures.append("google.genai was imported before first use")
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Peak memory and time to first response of list, generator and paged tools.
+
+Each tool produces the same large inventory of records. ``list`` builds it in memory before
+returning, ``generator`` yields records and is cut off at the result cap, and ``paged`` sends
+the records to the session in pages while it is still producing them::
+
+    python benchmarks/streaming.py --items 200000 --cap 50 --page 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+from google.genai import types  # noqa: E402
+
+from agent import Agent  # noqa: E402
+from fake_live import FakeClient  # noqa: E402
+
+ITEMS = 200_000
+
+
+def record(i: int) -> dict:
+    """Build one inventory record."""
+    return {"id": i, "name": f"Hotel {i}", "city": "New York", "rating": 3 + i % 20 / 10, "description": "A comfortable room. " * 8}
+
+
+def inventory_list(city: str) -> list[dict]:
+    """Return the full hotel inventory.
+
+    Args:
+        city: City to list.
+    """
+    return [record(i) for i in range(ITEMS)]
+
+
+def inventory(city: str) -> Iterator[dict]:
+    """Yield the full hotel inventory.
+
+    Args:
+        city: City to list.
+    """
+    for i in range(ITEMS):
+        yield record(i)
+
+
+class _TimingSession:
+    """Session stand-in that records when tool responses are sent."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.first: float | None = None
+        self.messages = 0
+
+    async def send(self, *, input: Any = None, end_of_turn: bool | None = False) -> None:
+        if self.first is None:
+            self.first = time.perf_counter() - self.started
+        self.messages += 1
+
+
+async def measure(tool: Any, **options: Any) -> dict[str, float]:
+    """Dispatch one call of ``tool`` and measure peak traced memory and time to the first send."""
+    agent = Agent(model="fake", client=FakeClient([]))
+    agent.add_tool(tool, **options)
+    tool_call = types.LiveServerToolCall(function_calls=[types.FunctionCall(id="call-1", name=tool.__name__, args={"city": "New York"})])
+    session = _TimingSession()
+
+    tracemalloc.start()
+    await agent._execute_tool_call(session, tool_call)
+    total = time.perf_counter() - session.started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await agent.close()
+    return {"first_ms": session.first * 1000, "total_ms": total * 1000, "peak_kb": peak / 1024, "messages": session.messages}
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the capped and full-result comparisons."""
+    global ITEMS
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--items", type=int, default=ITEMS, help=f"Records produced by each tool (default: {ITEMS})")
+    parser.add_argument("--cap", type=int, default=50, help="max_result_items of the capped runs (default: 50)")
+    parser.add_argument("--page", type=int, default=1000, help="page_items of the paged run (default: 1000)")
+    args = parser.parse_args(argv)
+    ITEMS = args.items
+
+    runs = [
+        (f"capped at {args.cap}", "list", inventory_list, {"max_result_items": args.cap}),
+        (f"capped at {args.cap}", "generator", inventory, {"max_result_items": args.cap}),
+        ("full result", "list", inventory_list, {}),
+        ("full result", "paged", inventory, {"page_items": args.page}),
+    ]
+    print(f"{'scenario':<16}{'tool':<11}{'first send':>12}{'total':>12}{'peak mem':>14}{'sends':>7}")
+    for scenario, label, tool, options in runs:
+        result = asyncio.run(measure(tool, **options))
+        print(
+            f"{scenario:<16}{label:<11}{result['first_ms']:>10.1f}ms{result['total_ms']:>10.1f}ms"
+            f"{result['peak_kb'] / 1024:>11.1f}MiB{result['messages']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""Offline benchmark suite for Agent against the in-process fake Live API.
+
+Measures throughput, p50/p99 latency and peak traced memory of ``Agent.run``, tool dispatch
+and schema generation at several concurrency levels, and writes the results as JSON so runs
+can be compared::
+
+    python benchmarks/suite.py -o before.json
+    python benchmarks/suite.py -o after.json --compare before.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+from google.genai import types  # noqa: E402
+
+import travel_tools  # noqa: E402
+from agent import Agent  # noqa: E402
+from fake_live import CallTools, FakeClient, Text  # noqa: E402
+from utils import compile_function  # noqa: E402
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+TOOLS = [
+    travel_tools.get_current_weather,
+    travel_tools.query_calendar,
+    travel_tools.cancel_appointment,
+    travel_tools.get_flight_options,
+    travel_tools.query_sqlite_hotels,
+    travel_tools.query_loyalty_programs,
+]
+
+FANOUT = [
+    ("get_flight_options", {"origin": "San Francisco", "destination": "New York", "date": "today"}),
+    ("query_sqlite_hotels", {"city": "New York", "rating_min": "4"}),
+    ("query_loyalty_programs", {"destination": "New York"}),
+    ("get_current_weather", {"location": "New York"}),
+]
+
+SCRIPT = [Text("Let me check. "), CallTools(FANOUT), Text("Here is your plan.")]
+
+
+class _SinkSession:
+    """Session stand-in that discards tool responses."""
+
+    async def send(self, *, input: Any = None, end_of_turn: bool | None = False) -> None:
+        pass
+
+
+def make_agent(latency: float, jitter: float) -> Agent:
+    """Build an agent with the example tools talking to a fake Live API."""
+    agent = Agent(model="fake", client=FakeClient(SCRIPT, latency=latency, jitter=jitter, seed=0))
+    for tool in TOOLS:
+        agent.add_tool(tool)
+    return agent
+
+
+async def measure(operation: Callable[[], Awaitable[Any]], concurrency: int, ops: int) -> dict[str, float]:
+    """Run ``ops`` operations with ``concurrency`` in flight and summarize their latencies."""
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(ops)))
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "ops": ops,
+        "seconds": elapsed,
+        "throughput": ops / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+        "peak_mem_kb": peak / 1024,
+    }
+
+
+async def bench_run(concurrency: int, ops: int, latency: float, jitter: float) -> dict[str, float]:
+    """Benchmark full ``Agent.run`` turns with a four-way tool fan-out."""
+    agent = make_agent(latency, jitter)
+    try:
+        return await measure(lambda: agent.run("Plan my trip to New York"), concurrency, ops)
+    finally:
+        await agent.close()
+
+
+async def bench_dispatch(concurrency: int, ops: int, latency: float, jitter: float) -> dict[str, float]:
+    """Benchmark ``_execute_tool_call`` on a four-way fan-out without any network."""
+    agent = make_agent(latency, jitter)
+    session = _SinkSession()
+    tool_call = types.LiveServerToolCall(
+        function_calls=[types.FunctionCall(id=f"call-{i}", name=name, args=args) for i, (name, args) in enumerate(FANOUT)]
+    )
+    try:
+        return await measure(lambda: agent._execute_tool_call(session, tool_call), concurrency, ops)
+    finally:
+        await agent.close()
+
+
+async def bench_schema(concurrency: int, ops: int, latency: float, jitter: float) -> dict[str, float]:
+    """Benchmark uncached declaration compiles of the example tools."""
+
+    async def compile_all() -> None:
+        for tool in TOOLS:
+            compile_function(tool)
+
+    return await measure(compile_all, concurrency, ops)
+
+
+SCENARIOS = {"run": bench_run, "dispatch": bench_dispatch, "schema": bench_schema}
+
+
+def compare(results: list[dict[str, Any]], baseline_path: str) -> None:
+    """Print throughput and latency ratios against a previous results file."""
+    baseline = {(r["scenario"], r["concurrency"]): r for r in json.loads(Path(baseline_path).read_text())["results"]}
+    print(f"\n{'scenario':<10} {'conc':>5} {'throughput':>11} {'p50':>8} {'p99':>8} {'mem':>8}")
+    for result in results:
+        before = baseline.get((result["scenario"], result["concurrency"]))
+        if before is None:
+            continue
+        print(
+            f"{result['scenario']:<10} {result['concurrency']:>5} "
+            f"{result['throughput'] / before['throughput']:>10.2f}x "
+            f"{result['p50_ms'] / before['p50_ms']:>7.2f}x "
+            f"{result['p99_ms'] / before['p99_ms']:>7.2f}x "
+            f"{result['peak_mem_kb'] / before['peak_mem_kb']:>7.2f}x"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    """Run the selected scenarios and write their results as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS), help="Scenario to run (default: all)")
+    parser.add_argument("-c", "--concurrency", type=int, action="append", help="Concurrency level (default: 1, 100 and 1000)")
+    parser.add_argument("-n", "--ops-per-session", type=int, default=3, help="Operations per concurrent session (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.005, help="Fake server latency per message in seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="Fake server jitter per message in seconds")
+    parser.add_argument("-o", "--output", default="bench_output.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = []
+    for scenario in args.scenario or list(SCENARIOS):
+        for concurrency in args.concurrency or [1, 100, 1000]:
+            ops = concurrency * args.ops_per_session
+            result = asyncio.run(SCENARIOS[scenario](concurrency, ops, args.latency, args.jitter))
+            results.append({"scenario": scenario, "concurrency": concurrency, **result})
+            print(
+                f"{scenario:<10} c={concurrency:<5} {result['throughput']:>10.1f} ops/s "
+                f"p50={result['p50_ms']:.2f}ms p99={result['p99_ms']:.2f}ms peak={result['peak_mem_kb']:.0f}KiB"
+            )
+
+    meta = {"python": platform.python_version(), "platform": platform.platform(), "latency": args.latency, "jitter": args.jitter}
+    Path(args.output).write_text(json.dumps({"meta": meta, "results": results}, indent=2) + "\n")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
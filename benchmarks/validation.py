@@ -0,0 +1,35 @@
+"""Micro-benchmark of per-call argument validation overhead."""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path[:0] = [str(ROOT / "src"), str(ROOT)]
+
+from example import cancel_appointment, get_flight_options, query_loyalty_programs  # noqa: E402
+from validation import ArgumentValidator  # noqa: E402
+
+CASES = [
+    (cancel_appointment, {"appointment_id": 101.0}),
+    (get_flight_options, {"origin": "San Francisco", "destination": "New York", "date": "today"}),
+    (query_loyalty_programs, {"destination": "New York"}),
+]
+
+
+def main(number: int = 100_000) -> None:
+    """Print the mean cost of building and running each tool's validator."""
+    print(f"{'tool':<24} {'path':<9} {'build (us)':>11} {'validate (ns)':>14} {'baseline (ns)':>14}")
+    for tool, args in CASES:
+        build = timeit.timeit(lambda tool=tool: ArgumentValidator(tool), number=200) / 200
+        validator = ArgumentValidator(tool)
+        validate = timeit.timeit(lambda validator=validator, args=args: validator.validate(args), number=number) / number
+        baseline = timeit.timeit(lambda args=args: dict(args), number=number) / number
+        path = "fast" if validator.is_fast else "pydantic"
+        print(f"{tool.__name__:<24} {path:<9} {build * 1e6:>11.1f} {validate * 1e9:>14.0f} {baseline * 1e9:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,80 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import functools
+import inspect
+import logging
 import os
-from typing import TYPE_CHECKING
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
 
-from dotenv import load_dotenv
-from google import genai
-from google.genai import live, types
-
-from utils import create_response, parse_function
+from cache import make_key
+from context import collect_items, shrink_result
+from conversation import Conversation
+from events import TextDelta, ToolCallStarted, ToolResult, TurnComplete, collect_text
+from executor import ToolExecutor
+from hedging import HedgePolicy
+from pool import SessionPool
+from ratelimit import LimitedSession, is_quota_error
+from response_cache import make_task_key
+from utils import ToolOptions, create_response, parse_function
+from validation import build_validator
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Callable, Iterable
+
+    from google import genai
+    from google.genai import live, types
+
+    from cache import ToolCache
+    from cassette import CassetteRecorder
+    from context import ContextBudget
+    from events import Event
+    from metrics import Metrics
+    from prefetch import Prefetcher
+    from profiler import ToolProfiler
+    from ratelimit import Priority, RateLimiter
+    from response_cache import ResponseCache
+    from validation import ArgumentValidator
+
+logger = logging.getLogger(__name__)
+
+
+async def _drain_pages(pages: asyncio.Queue, execution: asyncio.Future) -> AsyncIterator[Any]:
+    """Yield items put on ``pages`` as they arrive, until ``execution`` is done and the queue is empty."""
+    while not execution.done() or not pages.empty():
+        if not pages.empty():
+            yield pages.get_nowait()
+            continue
+        getter = asyncio.ensure_future(pages.get())
+        await asyncio.wait((getter, execution), return_when=asyncio.FIRST_COMPLETED)
+        if getter.done():
+            yield getter.result()
+        else:
+            getter.cancel()
+
+
+@dataclass(slots=True)
+class TaskResult:
+    """Outcome of one task in :meth:`Agent.run_many`.
+
+    Attributes:
+        task: The task text.
+        response: The model response, or ``None`` if the task failed.
+        error: The error message if the task failed.
+    """
+
+    task: str
+    response: str | None = None
+    error: str | None = None
 
-load_dotenv()
+    @property
+    def ok(self) -> bool:
+        """Whether the task completed without an error."""
+        return self.error is None
 
 
 class Agent:
@@ -24,45 +85,486 @@ class Agent:
         self,
         model: str,
         system_instruction: str | None = None,
+        *,
+        pool_size: int = 0,
+        session_idle_timeout: float = 300.0,
+        session_max_uses: int | None = 8,
+        max_tool_concurrency: int = 8,
+        executor: ToolExecutor | None = None,
+        tool_cache: ToolCache | None = None,
+        tool_timeout: float | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        metrics: Metrics | None = None,
+        client: genai.Client | None = None,
+        recorder: CassetteRecorder | None = None,
+        context_budget: ContextBudget | None = None,
+        response_cache: ResponseCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+        priority: Priority = "interactive",
+        tenant: str = "default",
+        prefetcher: Prefetcher | None = None,
+        annotate_tools: bool = True,
+        profiler: ToolProfiler | None = None,
     ) -> None:
-        """Initialize agent with a model."""
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
+        """Initialize agent with a model.
+
+        Args:
+            model: The model to run tasks with.
+            system_instruction: Optional system instruction sent with every session.
+            pool_size: Maximum number of Live sessions kept open between tasks. ``0`` opens
+                a fresh session per task. Pooled sessions keep the context of earlier tasks
+                and are only reused by tasks of the same tenant.
+            session_idle_timeout: Seconds a pooled session may sit idle before it is closed.
+            session_max_uses: Tasks a pooled session serves before it is closed, bounding how
+                much earlier context a task can see. ``1`` isolates every task; ``None`` is unbounded.
+            max_tool_concurrency: Maximum number of function calls from one tool call run at once.
+            executor: Executor running tools off the event loop. Defaults to a new :class:`ToolExecutor`.
+            tool_cache: Cache for results of tools registered with ``cacheable=True``. May be shared between agents.
+            tool_timeout: Default seconds a tool may run before an error response is sent in its place.
+            hedge_policy: Policy for tools registered with ``hedge=True``. Defaults to a new :class:`HedgePolicy`.
+            metrics: Hook receiving latency, throughput and error measurements, such as
+                :class:`~metrics.InMemoryMetrics`. ``None`` disables instrumentation.
+            client: Client to open Live sessions with, such as :class:`~fake_live.FakeClient`
+                for offline runs or :class:`~cassette.ReplayClient` to replay a recording.
+                Defaults to a v1alpha client using ``GEMINI_API_KEY``, created on first use.
+                Call ``dotenv.load_dotenv()`` first to read the key from a ``.env`` file.
+            recorder: Records every message sent and received by this agent's sessions.
+            context_budget: Bounds the size of tool results sent to the model and of the history
+                re-sent when a conversation reconnects. ``None`` only applies per-tool limits.
+            response_cache: Persistent cache of whole-task responses used by :meth:`run` and
+                :meth:`run_many`. Tasks that call tools not registered with ``cacheable=True`` bypass it.
+            rate_limiter: Admission control for connects and messages, usually shared by every
+                agent in the process. Tasks failing with a quota error before producing any
+                output are retried after the limiter's backoff.
+            priority: Default admission priority of this agent's sessions.
+            tenant: Tenant this agent's requests are scheduled fairly under.
+            prefetcher: Speculatively runs tools registered with ``read_only=True`` according to its
+                rules, from the task text and from each tool call, so the real calls find their
+                results ready.
+            annotate_tools: Include a line for each tool call in the responses of :meth:`run`,
+                :meth:`run_many` and conversations. ``False`` returns the model text only and
+                never formats the calls.
+            profiler: Records call counts, argument and result sizes, wall and CPU time, and
+                sampled stacks of every tool call this agent executes.
+        """
+        if client is None and not os.getenv("GEMINI_API_KEY"):
             raise ValueError("API key must be provided in GEMINI_API_KEY environment variable")
 
-        self.client = genai.Client(api_key=api_key, http_options={"api_version": "v1alpha"})
+        self._client = client
         self.model = model
-        self.system_instruction = system_instruction
+        self._system_instruction = system_instruction
         self.tool_functions: dict[str, Callable] = {}
+        self.tool_options: dict[str, ToolOptions] = {}
+        self.tool_validators: dict[str, ArgumentValidator] = {}
         self.tool_declarations: list[dict] = []
+        self.sealed = False
+        self._configs: dict[tuple[bool, bool], types.LiveConnectConfig] = {}
+        self.max_tool_concurrency = max_tool_concurrency
+        self.executor = executor or ToolExecutor()
+        self.tool_cache = tool_cache
+        self.tool_timeout = tool_timeout
+        self.hedge_policy = hedge_policy or HedgePolicy()
+        self.metrics = metrics
+        self.recorder = recorder
+        self._context_budget = context_budget
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.priority: Priority = priority
+        self.tenant = tenant
+        self.prefetcher = prefetcher
+        self.annotate_tools = annotate_tools
+        self.profiler = profiler
+        self.pool_size = pool_size
+        self.session_idle_timeout = session_idle_timeout
+        self.session_max_uses = session_max_uses
+        self._pool: SessionPool | None = None
+
+    @property
+    def client(self) -> genai.Client:
+        """The client sessions are opened with; the default client is built on first access."""
+        if self._client is None:
+            from google import genai
+
+            self._client = genai.Client(api_key=os.getenv("GEMINI_API_KEY"), http_options={"api_version": "v1alpha"})
+        return self._client
+
+    @client.setter
+    def client(self, client: genai.Client) -> None:
+        self._client = client
+        if self._pool is not None:
+            self._pool.client = client
+
+    @property
+    def system_instruction(self) -> str | None:
+        """The system instruction sent with every session."""
+        return self._system_instruction
+
+    @system_instruction.setter
+    def system_instruction(self, system_instruction: str | None) -> None:
+        self._check_not_sealed()
+        self._system_instruction = system_instruction
+        self._configs.clear()
+
+    @property
+    def context_budget(self) -> ContextBudget | None:
+        """Bounds on tool results and reconnect history, and the server-side compression settings."""
+        return self._context_budget
+
+    @context_budget.setter
+    def context_budget(self, context_budget: ContextBudget | None) -> None:
+        self._check_not_sealed()
+        self._context_budget = context_budget
+        self._configs.clear()
 
-    def add_tool(self, tool: Callable) -> None:
-        """Register a callable function as a tool."""
+    @property
+    def pool(self) -> SessionPool | None:
+        """The session pool, created on first use, or ``None`` when pooling is disabled."""
+        if self._pool is None and self.pool_size:
+            self._pool = SessionPool(
+                self.client,
+                max_size=self.pool_size,
+                idle_timeout=self.session_idle_timeout,
+                max_uses=self.session_max_uses,
+                metrics=self.metrics,
+            )
+        return self._pool
+
+    def add_tool(
+        self,
+        tool: Callable,
+        *,
+        cpu_bound: bool = False,
+        cacheable: bool = False,
+        cache_ttl: float | None = None,
+        validate: bool = True,
+        timeout: float | None = None,
+        hedge: bool = False,
+        max_result_bytes: int | None = None,
+        max_result_items: int | None = None,
+        result_fields: Iterable[str] | None = None,
+        read_only: bool = False,
+        page_items: int | None = None,
+    ) -> None:
+        """Register a callable function as a tool.
+
+        Args:
+            tool: A sync or ``async def`` function. Async tools are awaited on the event loop,
+                sync tools run on the executor's thread pool. Generator and async generator
+                functions are consumed item by item, and the items are capped by the result
+                limits as they arrive, closing the generator once the limits are reached.
+            cpu_bound: Run a sync tool on the executor's process pool instead. The tool must be
+                importable at module level so it can be pickled.
+            cacheable: The tool is a pure lookup whose results may be served from the agent's
+                tool cache. Identical calls within one tool call then run only once.
+            cache_ttl: Seconds a cached result stays valid. Defaults to the cache's TTL.
+            validate: Coerce and validate call arguments against the tool signature before
+                dispatch, returning a structured error to the model when they don't match.
+            timeout: Seconds the tool may run before an error response is sent. Defaults to the
+                agent's ``tool_timeout``.
+            hedge: The tool is idempotent; start a second attempt when the first runs longer than
+                its recent p95 latency and use whichever finishes first.
+            max_result_bytes: Maximum serialized size of a result sent to the model; larger results
+                are shrunk. Defaults to the agent's context budget.
+            max_result_items: Maximum number of items kept in lists inside a result. Defaults to
+                the agent's context budget.
+            result_fields: Keys kept in the records of a result, such as the rows of a query.
+            read_only: The tool is cheap, idempotent and free of side effects, so the agent's
+                prefetcher may run it before the model asks for it.
+            page_items: Send the items of a generator tool to the model in pages of this many
+                while the tool is still running. The tool is declared non-blocking, and each
+                page is released once sent.
+
+        Raises:
+            RuntimeError: If the agent has been sealed.
+            ValueError: If the options cannot be combined with the tool.
+        """
+        self._check_not_sealed()
         func_name = tool.__name__
+        streaming = inspect.isgeneratorfunction(tool) or inspect.isasyncgenfunction(tool)
+        if streaming and cpu_bound:
+            raise ValueError(f"Generator tool {func_name!r} cannot run on the process pool")
+        if page_items is not None:
+            if not streaming:
+                raise ValueError(f"Tool {func_name!r} must be a generator to be paged")
+            if cacheable or hedge or read_only:
+                raise ValueError(f"Paged tool {func_name!r} cannot be cacheable, hedged or read-only")
+
         declaration = parse_function(tool)
+        if page_items is not None:
+            declaration = {**declaration, "behavior": "NON_BLOCKING"}
 
+        self.tool_declarations = [existing for existing in self.tool_declarations if existing["name"] != func_name]
         self.tool_declarations.append(declaration)
+        self._configs.clear()
         self.tool_functions[func_name] = tool
+        self.tool_options[func_name] = ToolOptions(
+            cpu_bound=cpu_bound,
+            cacheable=cacheable,
+            cache_ttl=cache_ttl,
+            timeout=timeout,
+            hedge=hedge,
+            max_result_bytes=max_result_bytes,
+            max_result_items=max_result_items,
+            result_fields=tuple(result_fields) if result_fields is not None else None,
+            read_only=read_only,
+            streaming=streaming,
+            page_items=page_items,
+        )
+        if validate:
+            self.tool_validators[func_name] = build_validator(tool)
+        else:
+            self.tool_validators.pop(func_name, None)
 
-    async def _execute_tool_call(self, session: live.AsyncLiveClientSession, tool_call: types.ToolCall) -> None:
-        """Execute function calls and send results back to the model."""
-        responses = []
+    def remove_tool(self, name: str) -> None:
+        """Unregister a tool by function name.
 
-        for function_call in tool_call.function_calls:
-            response = create_response(function_call, self.tool_functions)
-            responses.append(response)
+        Raises:
+            KeyError: If no tool with that name is registered.
+            RuntimeError: If the agent has been sealed.
+        """
+        self._check_not_sealed()
+        if name not in self.tool_functions:
+            raise KeyError(f"Tool {name!r} is not registered")
+
+        del self.tool_functions[name]
+        self.tool_options.pop(name, None)
+        self.tool_validators.pop(name, None)
+        self.tool_declarations = [declaration for declaration in self.tool_declarations if declaration["name"] != name]
+        self._configs.clear()
+
+    def seal(self) -> Agent:
+        """Freeze the tool registry and compile the connect config for every flag combination.
+
+        A sealed agent rejects :meth:`add_tool`, :meth:`remove_tool` and changes to
+        :attr:`system_instruction` and :attr:`context_budget`, so its configs are built
+        exactly once and can be shared by any number of concurrent tasks.
+
+        Returns:
+            The agent itself.
+        """
+        for enable_code_execution in (False, True):
+            for enable_google_search in (False, True):
+                self._build_config(enable_code_execution=enable_code_execution, enable_google_search=enable_google_search)
+        self.sealed = True
+        return self
+
+    def _check_not_sealed(self) -> None:
+        if self.sealed:
+            raise RuntimeError("The agent is sealed; its tools and config can no longer be changed")
+
+    async def _execute_tool_call(
+        self,
+        session: live.AsyncLiveClientSession,
+        tool_call: types.ToolCall,
+        on_page: Callable[[types.FunctionResponse], None] | None = None,
+    ) -> list[types.FunctionResponse]:
+        """Execute function calls concurrently and send results back to the model.
+
+        Responses are sent in the order the model issued the calls, each carrying its call ``id``.
+        Cancelling the caller cancels every call still in flight.
+
+        Returns:
+            The function responses that were sent.
+        """
+        from google.genai import types
+
+        semaphore = asyncio.Semaphore(max(1, self.max_tool_concurrency))
+        inflight: dict[str, asyncio.Future[dict]] = {}
+
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.observe("agent_tool_fanout", len(tool_call.function_calls))
+
+        prefetcher = self.prefetcher
+        if prefetcher is not None:
+            for function_call in tool_call.function_calls:
+                self._prefetch(function_call.name, dict(function_call.args or {}))
+
+        async def execute(function_call: types.FunctionCall, options: ToolOptions | None) -> types.FunctionResponse:
+            if prefetcher is not None and options is not None and options.read_only:
+                parked = prefetcher.take(function_call.name, function_call.args)
+                if parked is not None and not parked.cancelled():
+                    try:
+                        response, _ = await parked
+                    except asyncio.CancelledError:
+                        # Only our own cancellation propagates; a prefetch cancelled elsewhere
+                        # (evicted or the prefetcher closed) falls back to running the tool.
+                        if asyncio.current_task().cancelling():
+                            raise
+                    except Exception:
+                        pass
+                    else:
+                        if "error" not in response:
+                            return types.FunctionResponse(name=function_call.name, id=function_call.id, response=response)
+
+            async with semaphore:
+                return await self._call_tool(function_call, options, session, on_page)
+
+        async def execute_cached(key: str, function_call: types.FunctionCall, options: ToolOptions) -> dict:
+            response = (await execute(function_call, options)).response or {}
+            if "error" not in response:
+                self.tool_cache.set(key, response, options.cache_ttl)
+            return response
+
+        async def respond(function_call: types.FunctionCall) -> types.FunctionResponse:
+            options = self.tool_options.get(function_call.name)
+            if self.tool_cache is None or options is None or not options.cacheable:
+                return await execute(function_call, options)
+
+            key = make_key(function_call.name, function_call.args)
+            if key in inflight:
+                self.tool_cache.coalesced += 1
+                response = await inflight[key]
+            elif (response := self.tool_cache.get(key)) is None:
+                inflight[key] = asyncio.ensure_future(execute_cached(key, function_call, options))
+                response = await inflight[key]
+
+            return types.FunctionResponse(name=function_call.name, id=function_call.id, response=response)
+
+        responses = await asyncio.gather(*(respond(function_call) for function_call in tool_call.function_calls))
 
         if responses:
-            await session.send(input=types.LiveClientToolResponse(function_responses=responses))
+            message = types.LiveClientToolResponse(function_responses=list(responses))
+            await session.send(input=message)
+            if metrics is not None:
+                metrics.increment("agent_bytes_sent_total", len(message.model_dump_json(exclude_none=True)))
 
-    async def run(
+        return list(responses)
+
+    async def _call_tool(
         self,
-        task: str,
-        *,
-        enable_code_execution: bool = True,
-        enable_google_search: bool = False,
-    ) -> str:
-        """Execute a task with the model and return its response."""
+        function_call: types.FunctionCall,
+        options: ToolOptions | None,
+        session: live.AsyncLiveClientSession | None = None,
+        on_page: Callable[[types.FunctionResponse], None] | None = None,
+    ) -> types.FunctionResponse:
+        """Validate, run and shrink one function call, recording its tool metrics.
+
+        ``session`` receives the pages of a paged tool before the final response is returned,
+        and ``on_page`` is called with each page once it is sent.
+        """
+        metrics = self.metrics
+        validator = self.tool_validators.get(function_call.name)
+        timeout = options.timeout if options and options.timeout is not None else self.tool_timeout
+        streaming = options is not None and options.streaming
+        tool_functions = self.tool_functions
+        sample = None
+        if self.profiler is not None and (tool := tool_functions.get(function_call.name)) is not None:
+            sample = self.profiler.start(function_call.name, function_call.args)
+            tool_functions = {function_call.name: sample.wrap(tool, options)}
+        started = time.perf_counter()
+        response = await create_response(
+            function_call,
+            tool_functions,
+            self.executor,
+            options,
+            validator,
+            timeout=timeout,
+            hedge_policy=self.hedge_policy,
+            collect=functools.partial(self._collect_items, function_call, options, session, on_page) if streaming else None,
+        )
+        if not streaming:
+            # Streaming results were capped while they were collected.
+            response.response = self._shrink_result(response.response or {}, options)
+        elapsed = time.perf_counter() - started
+        if sample is not None:
+            self.profiler.finish(sample, response.response or {}, elapsed)
+        if metrics is not None:
+            metrics.observe("agent_tool_seconds", elapsed, tool=function_call.name)
+            metrics.increment("agent_tool_calls_total", tool=function_call.name)
+            if "error" in (response.response or {}):
+                metrics.increment("agent_tool_errors_total", tool=function_call.name)
+        return response
+
+    def _prefetch(self, after: str | None, source: dict) -> None:
+        """Start the prefetches the prefetcher predicts from a task or tool call."""
+        from google.genai import types
+
+        async def run(name: str, args: dict) -> dict:
+            response = await self._call_tool(types.FunctionCall(name=name, args=args), self.tool_options[name])
+            return response.response or {}
+
+        def allowed(name: str) -> bool:
+            options = self.tool_options.get(name)
+            return options is not None and options.read_only
+
+        self.prefetcher.trigger(after, source, run, allowed=allowed)
+
+    async def _collect_items(
+        self,
+        function_call: types.FunctionCall,
+        options: ToolOptions,
+        session: live.AsyncLiveClientSession | None,
+        on_page: Callable[[types.FunctionResponse], None] | None,
+        items: AsyncIterator[Any],
+    ) -> list[Any]:
+        """Collect a streaming tool's items within its result limits, sending full pages to the session."""
+        from google.genai import types
+
+        budget = self.context_budget
+        max_bytes = options.max_result_bytes
+        max_items = options.max_result_items
+        if budget is not None:
+            max_bytes = max_bytes if max_bytes is not None else budget.max_result_bytes
+            max_items = max_items if max_items is not None else budget.max_result_items
+
+        async def send_page(page: list[Any], number: int) -> None:
+            response = types.FunctionResponse(
+                name=function_call.name,
+                id=function_call.id,
+                response={"result": page, "page": number},
+                will_continue=True,
+                scheduling=types.FunctionResponseScheduling.SILENT,
+            )
+            message = types.LiveClientToolResponse(function_responses=[response])
+            await session.send(input=message)
+            if self.metrics is not None:
+                self.metrics.increment("agent_bytes_sent_total", len(message.model_dump_json(exclude_none=True)))
+            if on_page is not None:
+                on_page(response)
+
+        return await collect_items(
+            items,
+            max_bytes=max_bytes,
+            max_items=max_items,
+            max_string_bytes=budget.max_string_bytes if budget is not None else None,
+            fields=options.result_fields,
+            page_items=options.page_items if session is not None else None,
+            send_page=send_page,
+        )
+
+    def _shrink_result(self, response: dict, options: ToolOptions | None) -> dict:
+        """Apply the tool's result limits, falling back to the context budget, to a tool response."""
+        budget = self.context_budget
+        if "error" in response or (options is None and budget is None):
+            return response
+
+        fields = options.result_fields if options else None
+        max_bytes = options.max_result_bytes if options else None
+        max_items = options.max_result_items if options else None
+        if budget is not None:
+            return budget.shrink(response, max_bytes=max_bytes, max_items=max_items, fields=fields)
+        if fields is None and max_bytes is None and max_items is None:
+            return response
+        return shrink_result(response, max_bytes=max_bytes, max_items=max_items, fields=fields)
+
+    def _build_config(self, *, enable_code_execution: bool, enable_google_search: bool) -> types.LiveConnectConfig:
+        """Return the Live connect config for the given built-in tool flags.
+
+        Configs are validated once per flag combination and cached until the tools, the system
+        instruction or the context budget change. The returned config is shared and must not be mutated.
+        """
+        flags = (enable_code_execution, enable_google_search)
+        if (config := self._configs.get(flags)) is None:
+            config = self._configs[flags] = self._compile_config(
+                enable_code_execution=enable_code_execution, enable_google_search=enable_google_search
+            )
+        return config
+
+    def _compile_config(self, *, enable_code_execution: bool, enable_google_search: bool) -> types.LiveConnectConfig:
+        """Assemble and validate the Live connect config for the given built-in tool flags."""
+        from google.genai import types
+
         tools = []
         if self.tool_declarations:
             tools.append(types.Tool(function_declarations=self.tool_declarations))
@@ -77,26 +579,402 @@ class Agent:
         }
 
         if self.system_instruction:
-            config["system_instruction"] = self.system_instruction
+            # Pre-converted so the SDK's in-place normalization of a shared config is a no-op.
+            config["system_instruction"] = types.Content(role="user", parts=[types.Part(text=self.system_instruction)])
 
-        try:
-            async with self.client.aio.live.connect(model=self.model, config=config) as session:
-                await session.send(input=task, end_of_turn=True)
+        if self.context_budget is not None:
+            config.update(self.context_budget.session_config())
+
+        return types.LiveConnectConfig(**config)
+
+    @contextlib.asynccontextmanager
+    async def _connect(
+        self,
+        config: types.LiveConnectConfig,
+        *,
+        use_pool: bool = True,
+        priority: Priority | None = None,
+        tenant: str | None = None,
+    ) -> AsyncIterator[live.AsyncSession]:
+        """Open a session for the config, borrowing from the pool when one is configured.
+
+        With a rate limiter, opening a new socket waits for a connect token and every message
+        sent on the session waits for a message token.
+        """
+        async with self._lease(config, use_pool=use_pool, priority=priority, tenant=tenant) as (session, _):
+            yield session
 
-                final_response = []
-                async for response in session.receive():
-                    if text := response.text:
-                        final_response.append(text)
-                    elif tool_call := response.tool_call:
-                        for fc in tool_call.function_calls:
-                            args_str = ", ".join(f"{k}='{v}'" for k, v in fc.args.items())
-                            tool_info = f"\n🔧 **Tool**: `{fc.name}({args_str})`\n\n"
-                            final_response.append(tool_info)
+    @contextlib.asynccontextmanager
+    async def _lease(
+        self,
+        config: types.LiveConnectConfig,
+        *,
+        use_pool: bool = True,
+        fresh: bool = False,
+        priority: Priority | None = None,
+        tenant: str | None = None,
+    ) -> AsyncIterator[tuple[live.AsyncSession, bool]]:
+        """Like :meth:`_connect`, also yielding whether the session is a warm one taken from the pool.
+
+        ``fresh`` opens a new pooled socket instead of taking an idle one. A pooled session is
+        returned to the pool when the block exits normally and closed when it raises.
+        """
+        limiter = self.rate_limiter
+        priority = priority or self.priority
+        tenant = tenant or self.tenant
+
+        async def admit() -> None:
+            await limiter.acquire(self.model, "connect", priority=priority, tenant=tenant)
+
+        def wrap(session: live.AsyncSession) -> live.AsyncSession:
+            if self.recorder is not None:
+                session = self.recorder.wrap(session, self.model)
+            return session if limiter is None else LimitedSession(session, limiter, self.model, priority, tenant)
+
+        before_connect = admit if limiter is not None else None
+        if use_pool and self.pool is not None:
+            pool = self.pool
+            pooled = await pool.acquire(self.model, config, tenant=tenant, fresh=fresh, before_connect=before_connect)
+            broken = True
+            try:
+                yield wrap(pooled.session), pooled.warm
+                broken = False
+            finally:
+                await pool.release(pooled, broken=broken)
+            return
+
+        if before_connect is not None:
+            await before_connect()
+        async with self.client.aio.live.connect(model=self.model, config=config) as session:
+            yield wrap(session), False
+
+    async def prewarm(
+        self,
+        count: int = 1,
+        *,
+        enable_code_execution: bool = True,
+        enable_google_search: bool = False,
+        tenant: str | None = None,
+    ) -> int:
+        """Open pooled sessions ahead of the first task so it skips the connect handshake.
+
+        Sessions are reserved for ``tenant``, the agent's tenant by default.
+
+        Returns:
+            The number of sessions opened.
+
+        Raises:
+            RuntimeError: If the agent was created without a session pool.
+        """
+        if self.pool is None:
+            raise RuntimeError("Session pooling is disabled; create the agent with pool_size > 0")
+
+        config = self._build_config(enable_code_execution=enable_code_execution, enable_google_search=enable_google_search)
+        return await self.pool.prewarm(self.model, config, count, tenant=tenant or self.tenant)
+
+    async def close(self) -> None:
+        """Close any pooled sessions and shut down the tool executor."""
+        if self.prefetcher is not None:
+            self.prefetcher.close()
+        if self._pool is not None:
+            await self._pool.close()
+        self.executor.shutdown(wait=False)
+
+    async def stream(
+        self,
+        task: str,
+        *,
+        enable_code_execution: bool = True,
+        enable_google_search: bool = False,
+        priority: Priority | None = None,
+        tenant: str | None = None,
+    ) -> AsyncIterator[Event]:
+        """Execute a task and yield events as they come off the session.
+
+        ``priority`` and ``tenant`` override the agent's defaults for rate limiter admission.
 
-                        await self._execute_tool_call(session, tool_call)
+        Yields:
+            :class:`~events.TextDelta` for each text chunk, :class:`~events.ToolCallStarted` and
+            :class:`~events.ToolResult` around every function call, and :class:`~events.TurnComplete`
+            when the model ends its turn.
+
+        Raises:
+            Exception: Errors from the Live API session are propagated to the caller.
+        """
+        config = self._build_config(enable_code_execution=enable_code_execution, enable_google_search=enable_google_search)
+        started = time.perf_counter()
+        fresh = False
+
+        while True:
+            yielded = False
+            warm = False
+            try:
+                async with self._lease(config, fresh=fresh, priority=priority, tenant=tenant) as (session, warm):
+                    if self.metrics is not None:
+                        self.metrics.observe("agent_connect_seconds", time.perf_counter() - started)
+
+                    async for event in self._stream_turn(session, task):
+                        yielded = True
+                        yield event
+            except Exception as e:
+                # The server drops idle sockets, so a warm pooled session may already be closed.
+                # Its first send or receive fails before anything was yielded; retry once on a new socket.
+                if not warm or yielded or fresh:
+                    raise
+                logger.info("Pooled session for %s failed before its first event (%s); retrying on a new session", self.model, e)
+                fresh = True
+                continue
+            return
+
+    def _has_paged_tool(self, tool_call: types.ToolCall) -> bool:
+        for function_call in tool_call.function_calls:
+            options = self.tool_options.get(function_call.name)
+            if options is not None and options.page_items is not None:
+                return True
+        return False
 
-                return "".join(final_response).strip()
+    async def _stream_turn(self, session: live.AsyncSession, message: str) -> AsyncIterator[Event]:
+        """Send one user turn on an open session and yield its events until the turn completes."""
+        metrics = self.metrics
+        if self.prefetcher is not None:
+            self._prefetch(None, {"task": message})
+        await session.send(input=message, end_of_turn=True)
 
+        if metrics is not None:
+            sent_at = time.perf_counter()
+            metrics.increment("agent_bytes_sent_total", len(message.encode()))
+            first_text_at = None
+            tool_response_at = None
+
+        async for response in session.receive():
+            if metrics is not None:
+                received_at = time.perf_counter()
+                metrics.increment("agent_bytes_received_total", len(response.model_dump_json(exclude_none=True)))
+                if tool_response_at is not None:
+                    metrics.observe("agent_model_think_seconds", received_at - tool_response_at)
+                    tool_response_at = None
+
+            if text := response.text:
+                if metrics is not None and first_text_at is None:
+                    first_text_at = received_at
+                    metrics.observe("agent_ttft_seconds", first_text_at - sent_at)
+                yield TextDelta(text)
+            elif tool_call := response.tool_call:
+                for fc in tool_call.function_calls:
+                    yield ToolCallStarted(fc.id, fc.name, dict(fc.args or {}))
+
+                if self._has_paged_tool(tool_call):
+                    pages: asyncio.Queue[types.FunctionResponse] = asyncio.Queue()
+                    execution = asyncio.ensure_future(self._execute_tool_call(session, tool_call, pages.put_nowait))
+                    try:
+                        async for page in _drain_pages(pages, execution):
+                            yield ToolResult(page.id, page.name, page.response or {}, page.response["page"])
+                    finally:
+                        if not execution.done():
+                            execution.cancel()
+                            with contextlib.suppress(asyncio.CancelledError):
+                                await execution
+                    function_responses = execution.result()
+                else:
+                    function_responses = await self._execute_tool_call(session, tool_call)
+                if metrics is not None:
+                    tool_response_at = time.perf_counter()
+
+                for function_response in function_responses:
+                    yield ToolResult(function_response.id, function_response.name, function_response.response or {})
+
+            if response.server_content and response.server_content.turn_complete:
+                if metrics is not None:
+                    metrics.observe("agent_turn_seconds", time.perf_counter() - sent_at)
+                yield TurnComplete()
+
+    def conversation(
+        self,
+        *,
+        enable_code_execution: bool = True,
+        enable_google_search: bool = False,
+        max_reconnects: int = 3,
+        max_history_turns: int = 20,
+    ) -> Conversation:
+        """Start a multi-turn conversation that keeps one Live session open across turns.
+
+        Use it as an async context manager, or call :meth:`Conversation.close` when done.
+
+        Args:
+            enable_code_execution: Enable the built-in code execution tool.
+            enable_google_search: Enable the built-in Google Search tool.
+            max_reconnects: Reconnect attempts per turn when the socket drops.
+            max_history_turns: Most recent turns re-sent to a new session after a reconnect.
+        """
+        return Conversation(
+            self,
+            enable_code_execution=enable_code_execution,
+            enable_google_search=enable_google_search,
+            max_reconnects=max_reconnects,
+            max_history_turns=max_history_turns,
+        )
+
+    async def _stream_admitted(self, task: str, **options: Any) -> AsyncIterator[Event]:
+        """Run :meth:`stream`, reporting quota errors to the rate limiter.
+
+        A task rejected for quota reasons before it yielded anything is retried once the
+        limiter's backoff has passed, up to its ``max_retries``.
+        """
+        limiter = self.rate_limiter
+        attempts = 0
+        while True:
+            yielded = False
+            try:
+                async for event in self.stream(task, **options):
+                    yielded = True
+                    yield event
+            except Exception as e:
+                if limiter is None or not is_quota_error(e):
+                    raise
+                pause = limiter.report_quota_error(self.model)
+                if yielded or attempts >= limiter.max_retries:
+                    raise
+                attempts += 1
+                logger.warning("Quota error for %s (%s); retrying in at least %.1fs, attempt %d", self.model, e, pause, attempts)
+                continue
+
+            if limiter is not None:
+                limiter.report_success(self.model)
+            return
+
+    async def _collect(
+        self,
+        task: str,
+        *,
+        enable_code_execution: bool,
+        enable_google_search: bool,
+        priority: Priority | None = None,
+        tenant: str | None = None,
+    ) -> str:
+        """Run a task through :meth:`stream` and join its events into the response text.
+
+        With a response cache, a cached response is returned without opening a session, and a
+        fresh one is stored unless the task called a tool that is not cacheable or a tool failed.
+        """
+        events = self._stream_admitted(
+            task,
+            enable_code_execution=enable_code_execution,
+            enable_google_search=enable_google_search,
+            priority=priority,
+            tenant=tenant,
+        )
+        cache = self.response_cache
+        if cache is None:
+            return await collect_text(events, annotate_tools=self.annotate_tools)
+
+        flags = {"enable_code_execution": enable_code_execution, "enable_google_search": enable_google_search}
+        if not self.annotate_tools:
+            # Only keyed when off, so entries stored before the option existed stay valid.
+            flags["annotate_tools"] = False
+        cacheable = [name for name, options in self.tool_options.items() if options.cacheable]
+        key = make_task_key(self.model, self.system_instruction, self.tool_declarations, flags, task, cacheable)
+        if (cached := await asyncio.to_thread(cache.get, key)) is not None:
+            self._record_response_cache("hit")
+            return cached
+
+        bypass = False
+
+        async def watch() -> AsyncIterator[Event]:
+            nonlocal bypass
+            async for event in events:
+                if isinstance(event, ToolCallStarted):
+                    options = self.tool_options.get(event.name)
+                    bypass = bypass or options is None or not options.cacheable
+                elif isinstance(event, ToolResult) and event.is_error:
+                    bypass = True
+                yield event
+
+        response = await collect_text(watch(), annotate_tools=self.annotate_tools)
+        if bypass:
+            cache.bypassed += 1
+            self._record_response_cache("bypass")
+        else:
+            self._record_response_cache("miss")
+            await asyncio.to_thread(cache.set, key, response)
+        return response
+
+    def _record_response_cache(self, result: str) -> None:
+        if self.metrics is not None:
+            self.metrics.increment("agent_response_cache_total", result=result)
+
+    async def run(
+        self,
+        task: str,
+        *,
+        enable_code_execution: bool = True,
+        enable_google_search: bool = False,
+        priority: Priority | None = None,
+        tenant: str | None = None,
+        raise_errors: bool = False,
+    ) -> str:
+        """Execute a task with the model and return its response.
+
+        ``priority`` and ``tenant`` override the agent's defaults for rate limiter admission. A
+        failure is returned as an ``"Error: ..."`` response unless ``raise_errors`` is set, in which
+        case it propagates to the caller.
+        """
+        try:
+            return await self._collect(
+                task,
+                enable_code_execution=enable_code_execution,
+                enable_google_search=enable_google_search,
+                priority=priority,
+                tenant=tenant,
+            )
         except Exception as e:
-            print(f"Error during Live API session: {e}")
+            if self.metrics is not None:
+                self.metrics.increment("agent_errors_total", kind=type(e).__name__)
+            if raise_errors:
+                raise
+            logger.error("Error during Live API session: %s", e, exc_info=True)
             return f"Error: {e}"
+
+    async def run_many(
+        self,
+        tasks: Iterable[str],
+        *,
+        concurrency: int = 8,
+        enable_code_execution: bool = True,
+        enable_google_search: bool = False,
+        priority: Priority = "batch",
+        tenant: str | None = None,
+    ) -> list[TaskResult]:
+        """Execute many tasks on the running event loop with bounded concurrency.
+
+        A failing task is reported in its :class:`TaskResult` and does not stop the batch.
+
+        Args:
+            tasks: The tasks to run.
+            concurrency: Maximum number of tasks in flight at once.
+            enable_code_execution: Enable the built-in code execution tool.
+            enable_google_search: Enable the built-in Google Search tool.
+            priority: Rate limiter admission priority of the batch.
+            tenant: Tenant the batch is scheduled under. Defaults to the agent's tenant.
+
+        Returns:
+            One result per task, in input order.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(task: str) -> TaskResult:
+            async with semaphore:
+                try:
+                    response = await self._collect(
+                        task,
+                        enable_code_execution=enable_code_execution,
+                        enable_google_search=enable_google_search,
+                        priority=priority,
+                        tenant=tenant,
+                    )
+                except Exception as e:
+                    if self.metrics is not None:
+                        self.metrics.increment("agent_errors_total", kind=type(e).__name__)
+                    return TaskResult(task, error=str(e) or type(e).__name__)
+                return TaskResult(task, response=response)
+
+        return list(await asyncio.gather(*(run_one(task) for task in tasks)))
@@ -0,0 +1,128 @@
+"""Memoization cache for tool results."""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize JSON-like values so equal arguments produce equal keys."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_key(name: str, args: dict[str, Any] | None) -> str:
+    """Build a cache key from a tool name and its canonicalized arguments.
+
+    Args:
+        name: The tool name.
+        args: The function call arguments.
+
+    Returns:
+        A string that is equal for calls of the same tool with equal arguments.
+    """
+    canonical = json.dumps(_normalize(args or {}), sort_keys=True, separators=(",", ":"), default=str)
+    return f"{name}:{canonical}"
+
+
+class ToolCache:
+    """LRU cache of tool responses with per-entry TTL and entry/byte bounds.
+
+    Only tools registered as cacheable are looked up, and only successful responses are stored.
+    One cache can be shared by several agents.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024, default_ttl: float = 300.0) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached responses.
+            max_bytes: Maximum total serialized size of cached responses.
+            default_ttl: Seconds a response stays valid when the tool sets no TTL of its own.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict[str, tuple[float, int, dict]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """Number of responses currently cached."""
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total serialized size of cached responses."""
+        return self._bytes
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def get(self, key: str) -> dict | None:
+        """Return the cached response for a key, or ``None`` on a miss or expired entry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, response = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def set(self, key: str, response: dict, ttl: float | None = None) -> bool:
+        """Store a response, evicting least recently used entries to stay within bounds.
+
+        Returns:
+            ``False`` if the response alone exceeds ``max_bytes`` and was not stored.
+        """
+        size = len(json.dumps(response, separators=(",", ":"), default=str))
+        if size > self.max_bytes:
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, size, response)
+        self._bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+        return True
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss, eviction and coalesced-call counters with the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
@@ -0,0 +1,195 @@
+"""Record and replay the messages exchanged by Live sessions."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from google.genai import types
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from google.genai import live
+
+
+def _encode_input(value: Any) -> dict:
+    """Encode a value passed to ``session.send`` for the log."""
+    if isinstance(value, str):
+        return {"text": value}
+    if hasattr(value, "model_dump"):
+        return {"type": type(value).__name__, "data": value.model_dump(mode="json", exclude_none=True)}
+    if isinstance(value, list | tuple):
+        return {"items": [_encode_input(item) for item in value]}
+    return {"repr": repr(value)}
+
+
+class CassetteRecorder:
+    """Appends every message of the sessions it wraps to a JSON lines log.
+
+    Each line is one event: ``{"s": session, "t": seconds since connect, "e": kind, ...}`` where
+    the kind is ``connect``, ``send`` or ``recv``. Several sessions may share one log; their
+    events are interleaved and told apart by ``s``.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Open the log for appending.
+
+        Args:
+            path: The log file. Existing contents are kept and new sessions are appended.
+        """
+        self.path = Path(path)
+        self._file = self.path.open("a", encoding="utf-8", buffering=1)
+        self._session_ids = itertools.count(self._next_session_id())
+
+    def _next_session_id(self) -> int:
+        last = -1
+        with self.path.open(encoding="utf-8") as log:
+            for line in log:
+                if line.strip():
+                    last = max(last, json.loads(line)["s"])
+        return last + 1
+
+    def write(self, event: dict) -> None:
+        """Append one event to the log."""
+        self._file.write(json.dumps(event, separators=(",", ":"), ensure_ascii=False) + "\n")
+
+    def wrap(self, session: live.AsyncSession, model: str) -> RecordingSession:
+        """Wrap an open session so its traffic is recorded."""
+        return RecordingSession(session, self, next(self._session_ids), model)
+
+    def close(self) -> None:
+        """Close the log file."""
+        self._file.close()
+
+
+class RecordingSession:
+    """Session wrapper that forwards to a real session and logs its traffic."""
+
+    def __init__(self, session: live.AsyncSession, recorder: CassetteRecorder, session_id: int, model: str) -> None:
+        """Start recording a session."""
+        self.session = session
+        self.recorder = recorder
+        self.session_id = session_id
+        self.started = time.monotonic()
+        self._record("connect", model=model)
+
+    def _record(self, kind: str, **fields: Any) -> None:
+        self.recorder.write({"s": self.session_id, "t": round(time.monotonic() - self.started, 6), "e": kind, **fields})
+
+    async def send(self, *, input: Any = None, end_of_turn: bool | None = False) -> None:
+        """Record and forward a client message."""
+        self._record("send", input=_encode_input(input), end_of_turn=bool(end_of_turn))
+        await self.session.send(input=input, end_of_turn=end_of_turn)
+
+    async def send_client_content(self, *, turns: Any = None, turn_complete: bool = True) -> None:
+        """Record and forward conversation turns."""
+        self._record("send", input=_encode_input(turns), end_of_turn=turn_complete)
+        await self.session.send_client_content(turns=turns, turn_complete=turn_complete)
+
+    async def receive(self) -> AsyncIterator[types.LiveServerMessage]:
+        """Forward server messages, recording each one."""
+        async for message in self.session.receive():
+            self._record("recv", message=message.model_dump(mode="json", exclude_none=True))
+            yield message
+
+    async def close(self) -> None:
+        """Close the wrapped session."""
+        await self.session.close()
+
+
+class ReplaySession:
+    """Plays back the server messages of one recorded session."""
+
+    def __init__(self, events: list[dict], client: ReplayClient) -> None:
+        """Initialize with the recorded events of a session."""
+        self.client = client
+        self._events = [event for event in events if event["e"] in ("send", "recv")]
+        self._cursor = 0
+        self._last_t = 0.0
+        self.sent: list[Any] = []
+
+    async def _wait_until(self, t: float) -> None:
+        if self.client.timing:
+            delay = (t - self._last_t) / self.client.speed
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self._last_t = max(self._last_t, t)
+
+    async def send(self, *, input: Any = None, end_of_turn: bool | None = False) -> None:
+        """Accept a client message, noting whether it differs from the recorded one."""
+        self.sent.append(input)
+        actual = _encode_input(input)
+        if self._cursor < len(self._events) and self._events[self._cursor]["e"] == "send":
+            expected = self._events[self._cursor]
+            self._cursor += 1
+            self._last_t = max(self._last_t, expected["t"])
+            if expected["input"] != actual:
+                self.client.mismatches.append({"expected": expected["input"], "actual": actual})
+        else:
+            self.client.mismatches.append({"expected": None, "actual": actual})
+
+    async def send_client_content(self, *, turns: Any = None, turn_complete: bool = True) -> None:
+        """Accept conversation turns, checked against the recording like :meth:`send`."""
+        await self.send(input=turns, end_of_turn=turn_complete)
+
+    async def receive(self) -> AsyncIterator[types.LiveServerMessage]:
+        """Yield recorded server messages up to the next turn completion or recorded send."""
+        while self._cursor < len(self._events) and self._events[self._cursor]["e"] == "recv":
+            event = self._events[self._cursor]
+            self._cursor += 1
+            await self._wait_until(event["t"])
+            message = types.LiveServerMessage.model_validate(event["message"])
+            yield message
+            if message.server_content and message.server_content.turn_complete:
+                return
+
+    async def close(self) -> None:
+        """Close the session."""
+
+
+class ReplayClient:
+    """Client stand-in that replays a log written by :class:`CassetteRecorder`.
+
+    Each ``connect`` replays the next recorded session in connect order. Use it as
+    ``Agent(model=..., client=ReplayClient(path))``. Client messages that differ from the
+    recorded ones are collected in :attr:`mismatches` rather than failing the run.
+    """
+
+    def __init__(self, path: str | Path, *, timing: bool = False, speed: float = 1.0) -> None:
+        """Load a log.
+
+        Args:
+            path: The log file to replay.
+            timing: Reproduce the recorded delays between server messages.
+            speed: Playback speed factor when ``timing`` is enabled.
+        """
+        sessions: dict[int, list[dict]] = {}
+        with Path(path).open(encoding="utf-8") as log:
+            for line in log:
+                if line.strip():
+                    event = json.loads(line)
+                    sessions.setdefault(event["s"], []).append(event)
+
+        self.timing = timing
+        self.speed = speed
+        self.mismatches: list[dict] = []
+        self._pending = [sessions[session_id] for session_id in sorted(sessions)]
+        self.aio = self
+        self.live = self
+
+    @contextlib.asynccontextmanager
+    async def connect(self, *, model: str, config: Any = None) -> AsyncIterator[ReplaySession]:
+        """Open the next recorded session.
+
+        Raises:
+            RuntimeError: If every recorded session has already been replayed.
+        """
+        if not self._pending:
+            raise RuntimeError("No recorded sessions left to replay")
+        yield ReplaySession(self._pending.pop(0), self)
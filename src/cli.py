@@ -0,0 +1,157 @@
+"""Command line entry point for running batches of tasks through an Agent."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import importlib
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from dotenv import load_dotenv
+
+from agent import Agent
+from profiler import ToolProfiler
+from response_cache import ResponseCache
+from workers import WorkerPool
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+def load_tool(spec: str) -> Callable:
+    """Import a tool from a ``module:function`` spec.
+
+    Raises:
+        ValueError: If the spec is not in ``module:function`` form.
+    """
+    module_name, sep, attr = spec.partition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(f"Tool must be given as module:function, got {spec!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def read_tasks(path: str) -> list[str]:
+    """Read one task per non-empty line from a file, or stdin for ``-``."""
+    text = sys.stdin.read() if path == "-" else Path(path).read_text(encoding="utf-8")
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the batch runner."""
+    parser = argparse.ArgumentParser(prog="gemini-agent", description="Run a batch of tasks through a Gemini agent.")
+    parser.add_argument("input", nargs="?", default="-", help="File with one task per line (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="File to write JSON lines results to (default: stdout)")
+    parser.add_argument("-m", "--model", required=True, help="Model to run the tasks with")
+    parser.add_argument("-s", "--system-instruction", help="System instruction for every session")
+    parser.add_argument("-t", "--tool", action="append", default=[], metavar="MODULE:FUNCTION", help="Register a tool (repeatable)")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Maximum tasks in flight at once (default: 8)")
+    parser.add_argument("--pool-size", type=int, default=0, help="Keep up to this many Live sessions open between tasks")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="Shard tasks across this many worker processes (default: run in-process)")
+    parser.add_argument("--response-cache", metavar="PATH", help="SQLite file caching responses of tasks that call no uncacheable tools")
+    parser.add_argument("--no-code-execution", action="store_true", help="Disable the built-in code execution tool")
+    parser.add_argument("--google-search", action="store_true", help="Enable the built-in Google Search tool")
+    parser.add_argument("--profile-tools", action="store_true", help="Print a table of per-tool calls, sizes and time to stderr")
+    parser.add_argument("--profile-stacks", metavar="PATH", help="Write sampled tool stacks in collapsed format for flame graphs")
+    parser.add_argument("--profile-sample-rate", type=float, default=0.1, help="Fraction of tool calls profiled for stacks (default: 0.1)")
+    parser.add_argument("--no-tool-annotations", action="store_true", help="Return the model text without a line per tool call")
+    parser.add_argument("--no-dotenv", action="store_true", help="Don't load environment variables from a .env file")
+    return parser
+
+
+def build_agent(
+    model: str,
+    system_instruction: str | None,
+    pool_size: int,
+    tools: Sequence[str],
+    response_cache: str | None,
+    annotate_tools: bool = True,
+) -> Agent:
+    """Build an agent with tools given as ``module:function`` specs.
+
+    Module-level so it can be pickled as the factory of worker processes.
+    """
+    cache = ResponseCache(response_cache) if response_cache else None
+    agent = Agent(
+        model=model,
+        system_instruction=system_instruction,
+        pool_size=pool_size,
+        response_cache=cache,
+        annotate_tools=annotate_tools,
+    )
+    for spec in tools:
+        agent.add_tool(load_tool(spec))
+    return agent
+
+
+async def run_batch(args: argparse.Namespace) -> int:
+    """Run the tasks described by parsed arguments and write their results.
+
+    Returns:
+        The number of tasks that failed.
+    """
+    factory = functools.partial(
+        build_agent,
+        args.model,
+        args.system_instruction,
+        args.pool_size,
+        args.tool,
+        args.response_cache,
+        not args.no_tool_annotations,
+    )
+    profiler = None
+    if args.profile_tools or args.profile_stacks:
+        profiler = ToolProfiler(sample_rate=args.profile_sample_rate if args.profile_stacks else 0.0)
+    tasks = read_tasks(args.input)
+    flags = {"enable_code_execution": not args.no_code_execution, "enable_google_search": args.google_search}
+
+    if args.workers > 0:
+        async with WorkerPool(factory, workers=args.workers) as pool:
+            results = await pool.run_many(tasks, concurrency=args.concurrency, **flags)
+    else:
+        agent = factory()
+        agent.profiler = profiler
+        try:
+            results = await agent.run_many(tasks, concurrency=args.concurrency, **flags)
+        finally:
+            await agent.close()
+            if agent.response_cache is not None:
+                agent.response_cache.close()
+
+    if profiler is not None:
+        if args.profile_tools:
+            print(profiler.format_table(), file=sys.stderr)
+        if args.profile_stacks:
+            profiler.write_collapsed(args.profile_stacks)
+
+    lines = [json.dumps({"task": result.task, "response": result.response, "error": result.error}, ensure_ascii=False) for result in results]
+    output = "\n".join(lines) + "\n" if lines else ""
+    if args.output == "-":
+        sys.stdout.write(output)
+    else:
+        Path(args.output).write_text(output, encoding="utf-8")
+
+    return sum(not result.ok for result in results)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the batch runner CLI.
+
+    Returns:
+        ``0`` if every task succeeded, ``1`` otherwise.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.workers > 0 and (args.profile_tools or args.profile_stacks):
+        parser.error("--profile-tools and --profile-stacks profile the in-process agent and cannot be combined with --workers")
+    if not args.no_dotenv:
+        load_dotenv()
+    failures = asyncio.run(run_batch(args))
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
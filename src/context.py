@@ -0,0 +1,231 @@
+"""Byte budgets for conversation history and tool results."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode())
+
+
+def _project(value: Any, fields: frozenset[str] | None, max_items: int | None, max_string_bytes: int | None, *, in_list: bool = False) -> Any:
+    if isinstance(value, dict):
+        items = value.items()
+        if fields is not None and in_list:
+            items = [(key, item) for key, item in items if key in fields]
+        return {key: _project(item, fields, max_items, max_string_bytes) for key, item in items}
+
+    if isinstance(value, list | tuple):
+        kept = list(value[:max_items]) if max_items is not None else list(value)
+        projected = [_project(item, fields, max_items, max_string_bytes, in_list=True) for item in kept]
+        if len(kept) < len(value):
+            projected.append(f"... {len(value) - len(kept)} more items omitted")
+        return projected
+
+    if isinstance(value, str) and max_string_bytes is not None and len(value) > max_string_bytes:
+        return value[:max_string_bytes] + f"... [{len(value) - max_string_bytes} characters omitted]"
+
+    return value
+
+
+def shrink_result(
+    value: Any,
+    *,
+    max_bytes: int | None = None,
+    max_items: int | None = None,
+    max_string_bytes: int | None = None,
+    fields: Sequence[str] | None = None,
+) -> Any:
+    """Shrink a tool result so it fits a byte budget before it is sent to the model.
+
+    Records (dictionaries inside lists) are projected onto ``fields``, lists are capped at
+    ``max_items`` and long strings are cut at ``max_string_bytes``. If the result is still
+    larger than ``max_bytes``, the list and string caps are halved until it fits; as a last
+    resort a truncated JSON preview is returned.
+
+    Args:
+        value: The tool result.
+        max_bytes: Maximum serialized size of the result.
+        max_items: Maximum number of items kept in any list.
+        max_string_bytes: Maximum length of any string.
+        fields: Keys kept in records inside lists.
+
+    Returns:
+        The result, or a smaller copy of it.
+    """
+    field_set = frozenset(fields) if fields is not None else None
+    if field_set is not None or max_items is not None or max_string_bytes is not None:
+        value = _project(value, field_set, max_items, max_string_bytes)
+
+    if max_bytes is None or _size(value) <= max_bytes:
+        return value
+
+    items = max_items or 64
+    strings = max_string_bytes or 4096
+    while items > 1 or strings > 64:
+        items = max(1, items // 2)
+        strings = max(64, strings // 2)
+        shrunk = _project(value, None, items, strings)
+        if _size(shrunk) <= max_bytes:
+            return shrunk
+
+    preview = json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+    return {"truncated": True, "original_bytes": len(preview.encode()), "preview": preview[: max(0, max_bytes - 80)]}
+
+
+async def collect_items(
+    items: AsyncIterator[Any],
+    *,
+    max_bytes: int | None = None,
+    max_items: int | None = None,
+    max_string_bytes: int | None = None,
+    fields: Sequence[str] | None = None,
+    page_items: int | None = None,
+    send_page: Callable[[list[Any], int], Awaitable[None]] | None = None,
+) -> list[Any]:
+    """Collect the items of a streaming tool into a list that fits a byte budget.
+
+    Each item is projected like a record of :func:`shrink_result` as it arrives, and iteration
+    stops as soon as another item would exceed ``max_items`` or ``max_bytes``, so the rest of the
+    result is never produced. With ``page_items``, every full page is passed to ``send_page`` with
+    its 1-based number and then released; the limits apply to all pages together.
+
+    Args:
+        items: The items produced by the tool. Closed when collection stops.
+        max_bytes: Maximum serialized size of all items together.
+        max_items: Maximum number of items, also applied to lists inside items.
+        max_string_bytes: Maximum length of any string.
+        fields: Keys kept in each item that is a record.
+        page_items: Items per page handed to ``send_page``.
+        send_page: Sends a full page to the model.
+
+    Returns:
+        The collected items, or the items after the last full page when paging, ending with a
+        marker string if the result was cut short.
+    """
+    field_set = frozenset(fields) if fields is not None else None
+    project = field_set is not None or max_items is not None or max_string_bytes is not None
+    page: list[Any] = []
+    pages = count = 0
+    used = 2  # the enclosing brackets
+    truncated = False
+    try:
+        async for item in items:
+            if max_items is not None and count >= max_items:
+                truncated = True
+                break
+
+            if project:
+                item = _project(item, field_set, max_items, max_string_bytes, in_list=True)
+            if max_bytes is not None:
+                size = _size(item) + (1 if count else 0)
+                if used + size > max_bytes:
+                    if count == 0:
+                        page.append(shrink_result(item, max_bytes=max(0, max_bytes - used)))
+                    truncated = True
+                    break
+                used += size
+
+            page.append(item)
+            count += 1
+            if page_items is not None and send_page is not None and len(page) >= page_items:
+                pages += 1
+                await send_page(page, pages)
+                page = []
+    finally:
+        aclose = getattr(items, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    if truncated:
+        page.append("... more items omitted")
+    return page
+
+
+class ContextBudget:
+    """Bounds the context a long-running session accumulates.
+
+    Tool results are shrunk with :func:`shrink_result` before they go into the tool response,
+    using per-tool limits from ``add_tool`` where set and these defaults otherwise. Conversation
+    history re-sent after a reconnect is kept within ``max_history_bytes``: the newest turns are
+    kept and older ones are summarized with ``summarizer`` or dropped. ``compression_trigger_tokens``
+    additionally asks the server to slide its context window once it grows past that size.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_history_bytes: int = 32_000,
+        max_result_bytes: int | None = 16_000,
+        max_result_items: int | None = None,
+        max_string_bytes: int | None = None,
+        summarizer: Callable[[list[tuple[str, str]]], str] | None = None,
+        compression_trigger_tokens: int | None = None,
+    ) -> None:
+        """Initialize the budget.
+
+        Args:
+            max_history_bytes: Maximum size of the history re-sent to a new session.
+            max_result_bytes: Default maximum serialized size of a tool result.
+            max_result_items: Default maximum number of items kept in lists inside tool results.
+            max_string_bytes: Default maximum length of strings inside tool results.
+            summarizer: Turns the (user, model) text pairs of old turns into a short summary.
+            compression_trigger_tokens: Server-side context size at which the Live API starts
+                sliding its context window, or ``None`` to leave it unbounded.
+        """
+        self.max_history_bytes = max_history_bytes
+        self.max_result_bytes = max_result_bytes
+        self.max_result_items = max_result_items
+        self.max_string_bytes = max_string_bytes
+        self.summarizer = summarizer
+        self.compression_trigger_tokens = compression_trigger_tokens
+
+    def shrink(
+        self,
+        value: Any,
+        *,
+        max_bytes: int | None = None,
+        max_items: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> Any:
+        """Shrink a tool result with per-tool limits, falling back to the budget defaults."""
+        return shrink_result(
+            value,
+            max_bytes=max_bytes if max_bytes is not None else self.max_result_bytes,
+            max_items=max_items if max_items is not None else self.max_result_items,
+            max_string_bytes=self.max_string_bytes,
+            fields=fields,
+        )
+
+    def compact_history(self, history: Sequence[tuple[str, str]]) -> list[tuple[str, str]]:
+        """Keep the newest turns that fit the history budget, summarizing or dropping the rest."""
+        kept: list[tuple[str, str]] = []
+        used = 0
+        for turn in reversed(history):
+            size = len(turn[0].encode()) + len(turn[1].encode())
+            if kept and used + size > self.max_history_bytes:
+                break
+            kept.append(turn)
+            used += size
+        kept.reverse()
+
+        older = list(history[: len(history) - len(kept)])
+        if older and self.summarizer is not None:
+            kept.insert(0, (f"Summary of the earlier conversation: {self.summarizer(older)}", ""))
+        return kept
+
+    def session_config(self) -> dict:
+        """Return connect config entries enabling server-side context window compression."""
+        if self.compression_trigger_tokens is None:
+            return {}
+        return {
+            "context_window_compression": {
+                "trigger_tokens": self.compression_trigger_tokens,
+                "sliding_window": {"target_tokens": self.compression_trigger_tokens // 2},
+            }
+        }
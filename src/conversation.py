@@ -0,0 +1,163 @@
+"""Multi-turn conversations over one long-lived Live session."""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import logging
+from typing import TYPE_CHECKING
+
+from events import TextDelta, TurnComplete, collect_text
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from google.genai import live, types
+
+    from agent import Agent
+    from events import Event
+
+logger = logging.getLogger(__name__)
+
+
+@functools.cache
+def disconnect_errors() -> tuple[type[BaseException], ...]:
+    """Errors that mean the socket dropped and the session can be reopened."""
+    from websockets.exceptions import ConnectionClosed
+
+    return (ConnectionClosed, ConnectionError, OSError)
+
+
+class Conversation:
+    """A chat with an :class:`~agent.Agent` that keeps its Live session open across turns.
+
+    Each turn only sends the new message; the model keeps the earlier turns in its session
+    context. Turns end when the server reports ``turn_complete``. If the socket drops, the
+    conversation reconnects and re-seeds the new session with its text history, compacted by
+    the agent's :class:`~context.ContextBudget` when it has one, before continuing. A turn
+    is retried transparently only if the drop happened before any of its events were yielded.
+    """
+
+    def __init__(
+        self,
+        agent: Agent,
+        *,
+        enable_code_execution: bool = True,
+        enable_google_search: bool = False,
+        max_reconnects: int = 3,
+        max_history_turns: int = 20,
+    ) -> None:
+        """Initialize a conversation; the session is opened on the first turn.
+
+        Args:
+            agent: The agent whose model, tools and client are used.
+            enable_code_execution: Enable the built-in code execution tool.
+            enable_google_search: Enable the built-in Google Search tool.
+            max_reconnects: Reconnect attempts per turn when the socket drops.
+            max_history_turns: Most recent turns re-sent to a new session after a reconnect.
+        """
+        self.agent = agent
+        self.config = agent._build_config(enable_code_execution=enable_code_execution, enable_google_search=enable_google_search)
+        self.max_reconnects = max_reconnects
+        self.max_history_turns = max_history_turns
+        self.history: list[tuple[str, str]] = []
+        self.reconnects = 0
+        self._stack: contextlib.AsyncExitStack | None = None
+        self._session: live.AsyncSession | None = None
+
+    @property
+    def turns(self) -> int:
+        """Number of completed turns."""
+        return len(self.history)
+
+    async def __aenter__(self) -> Conversation:
+        """Open the session."""
+        await self._open()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the session."""
+        await self.close()
+
+    def _seed_turns(self) -> list[types.Content]:
+        """Build the compacted history sent to a fresh session."""
+        from google.genai import types
+
+        history = self.history[-self.max_history_turns :]
+        if self.agent.context_budget is not None:
+            history = self.agent.context_budget.compact_history(history)
+
+        contents = []
+        for user_text, model_text in history:
+            contents.append(types.Content(role="user", parts=[types.Part(text=user_text)]))
+            if model_text:
+                contents.append(types.Content(role="model", parts=[types.Part(text=model_text)]))
+        return contents
+
+    async def _open(self) -> live.AsyncSession:
+        if self._session is not None:
+            return self._session
+
+        stack = contextlib.AsyncExitStack()
+        try:
+            session = await stack.enter_async_context(self.agent._connect(self.config, use_pool=False))
+            if self.history:
+                await session.send_client_content(turns=self._seed_turns(), turn_complete=False)
+        except BaseException:
+            await stack.aclose()
+            raise
+
+        self._stack, self._session = stack, session
+        return session
+
+    async def _drop(self) -> None:
+        stack, self._stack, self._session = self._stack, None, None
+        if stack is not None:
+            with contextlib.suppress(Exception):
+                await stack.aclose()
+
+    async def stream(self, message: str) -> AsyncIterator[Event]:
+        """Send a message and yield the events of the model's turn.
+
+        Raises:
+            Exception: Errors from the session, or the disconnect error once reconnects are exhausted.
+        """
+        attempts = 0
+        while True:
+            text: list[str] = []
+            yielded = False
+            completed = False
+            try:
+                session = await self._open()
+                async for event in self.agent._stream_turn(session, message):
+                    if isinstance(event, TextDelta):
+                        text.append(event.text)
+                    elif isinstance(event, TurnComplete):
+                        completed = True
+                    yielded = True
+                    yield event
+            except Exception as e:
+                await self._drop()
+                if not isinstance(e, disconnect_errors()) or yielded or attempts >= self.max_reconnects:
+                    raise
+                attempts += 1
+                self.reconnects += 1
+                logger.warning("Live session dropped (%s); reconnecting, attempt %d", e, attempts)
+                continue
+            except BaseException:
+                await self._drop()
+                raise
+
+            self.history.append((message, "".join(text)))
+            if not completed:
+                # The server closed the stream without ending the turn; reopen for the next one.
+                await self._drop()
+            return
+
+    async def send(self, message: str) -> str:
+        """Send a message and return the model's response for the turn."""
+        return await collect_text(self.stream(message), annotate_tools=self.agent.annotate_tools)
+
+    async def close(self) -> None:
+        """Close the session."""
+        await self._drop()
@@ -0,0 +1,104 @@
+"""SQLite connection pool for read-mostly tool data."""
+
+from __future__ import annotations
+
+import contextlib
+import itertools
+import queue
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+_memory_ids = itertools.count()
+
+
+class ConnectionPool:
+    """Bounded pool of SQLite connections that tools can share across dispatch threads.
+
+    Each connection is used by one thread at a time and returned to the pool afterwards.
+    Statements are compiled once per connection and reused, as long as callers pass constant
+    SQL strings with ``?`` parameters, through :mod:`sqlite3`'s statement cache.
+
+    ``database=None`` creates a private in-memory database shared by the pool's connections.
+    It is filled once by ``setup`` and lives as long as the pool.
+    """
+
+    def __init__(
+        self,
+        database: str | None = None,
+        *,
+        size: int = 8,
+        setup: Callable[[sqlite3.Connection], None] | None = None,
+        cached_statements: int = 128,
+    ) -> None:
+        """Open the pool.
+
+        Args:
+            database: Path of the database file, or ``None`` for a shared in-memory database.
+            size: Maximum number of connections.
+            setup: Called once on the first connection to create and fill the schema.
+            cached_statements: Compiled statements kept per connection.
+        """
+        if database is None:
+            self.database = f"file:agent-datastore-{next(_memory_ids)}?mode=memory&cache=shared"
+            self.uri = True
+        else:
+            self.database = database
+            self.uri = False
+
+        self.size = size
+        self.cached_statements = cached_statements
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Keeps an in-memory database alive and owns the schema.
+        self._primary = self._open()
+        if setup is not None:
+            with self._primary:
+                setup(self._primary)
+        self._idle.put(self._primary)
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.database, uri=self.uri, check_same_thread=False, cached_statements=self.cached_statements)
+        conn.row_factory = sqlite3.Row
+        if self.uri:
+            conn.execute("PRAGMA read_uncommitted = ON")
+        self._opened += 1
+        return conn
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the block, waiting if all are in use.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        if self._closed:
+            raise RuntimeError("Connection pool is closed")
+
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                conn = self._open() if self._opened < self.size else None
+            if conn is None:
+                conn = self._idle.get()
+
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self) -> None:
+        """Close the idle connections and refuse new borrowers."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
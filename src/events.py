@@ -0,0 +1,106 @@
+"""Typed events yielded by :meth:`agent.Agent.stream`."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterable
+
+
+@dataclass(frozen=True, slots=True)
+class TextDelta:
+    """A chunk of model text as it arrives from the session."""
+
+    text: str
+
+
+@dataclass(frozen=True, slots=True)
+class ToolCallStarted:
+    """The model asked for a function call that is about to be executed."""
+
+    id: str | None
+    name: str
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class ToolResult:
+    """The response sent back to the model for a function call.
+
+    A paged tool produces one result per page sent while it runs, numbered from 1 in ``page``,
+    followed by the final result with ``page`` set to ``None``.
+    """
+
+    id: str | None
+    name: str
+    response: dict[str, Any]
+    page: int | None = None
+
+    @property
+    def is_error(self) -> bool:
+        """Whether the tool call failed."""
+        return "error" in self.response
+
+
+@dataclass(frozen=True, slots=True)
+class TurnComplete:
+    """The model finished its turn."""
+
+
+Event = TextDelta | ToolCallStarted | ToolResult | TurnComplete
+
+
+def format_tool_call(event: ToolCallStarted) -> str:
+    """Format a function call as the annotation shown in response texts."""
+    args_str = ", ".join(f"{k}='{v}'" for k, v in event.args.items())
+    return f"\n🔧 **Tool**: `{event.name}({args_str})`\n\n"
+
+
+class Transcript:
+    """Text chunks and tool calls of a response, formatted only when rendered.
+
+    Tool calls are kept as their :class:`ToolCallStarted` events rather than as formatted
+    strings, so a transcript that is never rendered with annotations never formats them.
+    """
+
+    __slots__ = ("parts",)
+
+    def __init__(self) -> None:
+        """Initialize an empty transcript."""
+        self.parts: list[str | ToolCallStarted] = []
+
+    def append(self, event: Event) -> None:
+        """Record a text chunk or a tool call; other events are ignored."""
+        if isinstance(event, TextDelta):
+            self.parts.append(event.text)
+        elif isinstance(event, ToolCallStarted):
+            self.parts.append(event)
+
+    def render(self, *, annotate_tools: bool = True) -> str:
+        """Join the transcript into a response text, optionally annotated with the tools that were called."""
+        if annotate_tools:
+            text = "".join(part if isinstance(part, str) else format_tool_call(part) for part in self.parts)
+        else:
+            text = "".join(part for part in self.parts if isinstance(part, str))
+        return text.strip()
+
+    def __str__(self) -> str:
+        """Render with tool annotations."""
+        return self.render()
+
+
+async def collect_transcript(events: AsyncIterable[Event], *, annotate_tools: bool = True) -> Transcript:
+    """Record a stream of events in a :class:`Transcript`, dropping tool calls unless ``annotate_tools``."""
+    transcript = Transcript()
+    async for event in events:
+        if annotate_tools or isinstance(event, TextDelta):
+            transcript.append(event)
+    return transcript
+
+
+async def collect_text(events: AsyncIterable[Event], *, annotate_tools: bool = True) -> str:
+    """Join a stream of events into a response text, annotated with the tools that were called unless ``annotate_tools`` is false."""
+    transcript = await collect_transcript(events, annotate_tools=annotate_tools)
+    return transcript.render(annotate_tools=annotate_tools)
@@ -0,0 +1,130 @@
+"""Off-loop execution of tool functions."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable
+    from concurrent.futures import Executor
+
+
+def _take(iterator: Any, count: int) -> list[Any]:
+    return list(itertools.islice(iterator, count))
+
+
+async def iterate_tool(tool: Callable, args: dict[str, Any], *, threads: Executor | None = None, batch: int = 64) -> AsyncIterator[Any]:
+    """Call a generator tool and yield its items as they are produced.
+
+    Async generators are iterated on the event loop. Sync generators are advanced on ``threads``
+    (the loop's default executor if ``None``) up to ``batch`` items per hop. Closing the
+    iterator early closes the generator, so the tool stops producing.
+    """
+    if inspect.isasyncgenfunction(tool):
+        agen = tool(**args)
+        try:
+            async for item in agen:
+                yield item
+        finally:
+            await agen.aclose()
+        return
+
+    loop = asyncio.get_running_loop()
+    gen = tool(**args)
+    pending: asyncio.Future[list[Any]] | None = None
+    try:
+        while True:
+            pending = loop.run_in_executor(threads, _take, gen, batch)
+            items = await pending
+            for item in items:
+                yield item
+            if len(items) < batch:
+                return
+    finally:
+        if pending is not None and not pending.done():
+            # The generator is still running on a thread; close it once the batch is done.
+            pending.add_done_callback(lambda _: gen.close())
+        else:
+            gen.close()
+
+
+class ToolExecutor:
+    """Runs tools without blocking the event loop.
+
+    ``async def`` tools are awaited on the loop, synchronous tools run on a bounded thread
+    pool, and tools marked CPU-bound run on a process pool created on first use. Process-pool
+    tools and their arguments and results must be picklable.
+    """
+
+    def __init__(self, max_threads: int | None = None, max_processes: int | None = None) -> None:
+        """Initialize the executor.
+
+        Args:
+            max_threads: Size of the thread pool for synchronous tools. Defaults to
+                ``min(32, cpu_count + 4)`` like :class:`~concurrent.futures.ThreadPoolExecutor`.
+            max_processes: Size of the process pool for CPU-bound tools. Defaults to the CPU count.
+        """
+        self.max_threads = max_threads or min(32, (os.cpu_count() or 1) + 4)
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+
+    @property
+    def threads(self) -> ThreadPoolExecutor:
+        """The thread pool for synchronous tools, created on first use."""
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="agent-tool")
+        return self._threads
+
+    @property
+    def processes(self) -> ProcessPoolExecutor:
+        """The process pool for CPU-bound tools, created on first use."""
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.max_processes)
+        return self._processes
+
+    async def call(self, tool: Callable, args: dict[str, Any], *, cpu_bound: bool = False) -> Any:
+        """Call a tool with keyword arguments and return its result.
+
+        Args:
+            tool: The tool function to call.
+            args: Keyword arguments for the tool.
+            cpu_bound: Run a synchronous tool on the process pool instead of the thread pool.
+
+        Returns:
+            The value returned by the tool.
+        """
+        if inspect.iscoroutinefunction(tool):
+            return await tool(**args)
+
+        loop = asyncio.get_running_loop()
+        pool = self.processes if cpu_bound else self.threads
+        result = await loop.run_in_executor(pool, functools.partial(tool, **args))
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def iterate(self, tool: Callable, args: dict[str, Any], *, batch: int = 64) -> AsyncIterator[Any]:
+        """Call a generator tool and yield its items, advancing sync generators on the thread pool.
+
+        Args:
+            tool: The generator or async generator function to call.
+            args: Keyword arguments for the tool.
+            batch: Items pulled from a sync generator per thread hop.
+        """
+        return iterate_tool(tool, args, threads=self.threads, batch=batch)
+
+    def shutdown(self, *, wait: bool = True) -> None:
+        """Shut down any pools that were started."""
+        if self._threads is not None:
+            self._threads.shutdown(wait=wait)
+            self._threads = None
+        if self._processes is not None:
+            self._processes.shutdown(wait=wait)
+            self._processes = None
@@ -0,0 +1,169 @@
+"""In-process stand-in for the Live API that plays scripted conversations."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import itertools
+import random
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from google.genai import types
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Sequence
+
+
+@dataclass(frozen=True)
+class Text:
+    """A scripted text chunk from the model."""
+
+    text: str
+
+
+@dataclass(frozen=True)
+class CallTools:
+    """A scripted tool call fanning out to one or more functions.
+
+    The fake waits for the matching tool response before playing the next step.
+    """
+
+    calls: Sequence[tuple[str, dict[str, Any]]] = field(default_factory=tuple)
+
+
+Step = Text | CallTools
+
+
+class FakeLiveSession:
+    """Fake of ``live.AsyncSession`` driven by a script."""
+
+    def __init__(self, live: FakeLive) -> None:
+        """Initialize a session opened by a :class:`FakeLive`."""
+        self.live = live
+        self.sent: list[Any] = []
+        self.closed = False
+        self._turns: asyncio.Queue[Any] = asyncio.Queue()
+        self._tool_responses: asyncio.Queue[Any] = asyncio.Queue()
+
+    async def send(self, *, input: Any = None, end_of_turn: bool | None = False) -> None:
+        """Record a client message; text with ``end_of_turn`` starts a scripted turn."""
+        if self.closed:
+            raise ConnectionError("Session is closed")
+        self.sent.append(input)
+        self.live.messages_sent += 1
+
+        if isinstance(input, types.LiveClientToolResponse):
+            # Pages of a paged tool (``will_continue``) don't complete the scripted tool call.
+            if not all(response.will_continue for response in input.function_responses or []):
+                await self._tool_responses.put(input)
+        elif end_of_turn:
+            await self._turns.put(input)
+
+    async def send_client_content(self, *, turns: Any = None, turn_complete: bool = True) -> None:
+        """Record conversation turns; with ``turn_complete`` they start a scripted turn."""
+        if self.closed:
+            raise ConnectionError("Session is closed")
+        self.sent.append(turns)
+        self.live.messages_sent += 1
+        if turn_complete:
+            await self._turns.put(turns)
+
+    async def _delay(self) -> None:
+        latency = self.live.latency
+        if self.live.jitter:
+            latency += self.live.random.uniform(0, self.live.jitter)
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+    async def receive(self) -> AsyncIterator[types.LiveServerMessage]:
+        """Play the next scripted turn, ending with a ``turn_complete`` message."""
+        task = await self._turns.get()
+        script = self.live.script
+        steps = script(task) if callable(script) else script
+
+        for step in steps:
+            await self._delay()
+            if isinstance(step, Text):
+                yield types.LiveServerMessage(
+                    server_content=types.LiveServerContent(model_turn=types.Content(role="model", parts=[types.Part(text=step.text)]))
+                )
+                continue
+
+            ids = [f"call-{next(self.live.call_ids)}" for _ in step.calls]
+            function_calls = [types.FunctionCall(id=call_id, name=name, args=args) for call_id, (name, args) in zip(ids, step.calls, strict=True)]
+            yield types.LiveServerMessage(tool_call=types.LiveServerToolCall(function_calls=function_calls))
+
+            tool_response = await self._tool_responses.get()
+            answered = {response.id for response in tool_response.function_responses or []}
+            if missing := set(ids) - answered:
+                raise ValueError(f"Tool response is missing call ids {sorted(missing)}")
+
+        await self._delay()
+        yield types.LiveServerMessage(server_content=types.LiveServerContent(turn_complete=True))
+
+    async def close(self) -> None:
+        """Close the session."""
+        self.closed = True
+
+
+class FakeLive:
+    """Fake of ``client.aio.live`` whose ``connect`` opens :class:`FakeLiveSession` objects."""
+
+    def __init__(
+        self,
+        script: Sequence[Step] | Callable[[Any], Sequence[Step]],
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        connect_latency: float = 0.0,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize the fake.
+
+        Args:
+            script: Steps played for every turn, or a callable returning the steps for a turn's input.
+            latency: Seconds the server waits before each message.
+            jitter: Extra random delay per message, uniformly drawn from ``[0, jitter]`` seconds.
+            connect_latency: Seconds each connect takes, standing in for the TLS and websocket handshake.
+            seed: Seed for the jitter random generator.
+        """
+        self.script = script
+        self.latency = latency
+        self.jitter = jitter
+        self.connect_latency = connect_latency
+        self.random = random.Random(seed)
+        self.call_ids = itertools.count(1)
+        self.connects = 0
+        self.active = 0
+        self.messages_sent = 0
+
+    @contextlib.asynccontextmanager
+    async def connect(self, *, model: str, config: Any = None) -> AsyncIterator[FakeLiveSession]:
+        """Open a fake session after ``connect_latency`` seconds."""
+        if self.connect_latency > 0:
+            await asyncio.sleep(self.connect_latency)
+        self.connects += 1
+        self.active += 1
+        session = FakeLiveSession(self)
+        try:
+            yield session
+        finally:
+            self.active -= 1
+            await session.close()
+
+
+class FakeClient:
+    """Fake of ``genai.Client`` exposing a :class:`FakeLive` as ``client.aio.live``.
+
+    Example:
+        .. code-block:: python
+
+            client = FakeClient([Text("Checking."), CallTools([("get_current_weather", {"location": "Paris"})]), Text("Sunny.")])
+            agent = Agent(model="fake", client=client)
+    """
+
+    def __init__(self, script: Sequence[Step] | Callable[[Any], Sequence[Step]], **options: Any) -> None:
+        """Initialize with a script and :class:`FakeLive` options."""
+        self.live = FakeLive(script, **options)
+        self.aio = self
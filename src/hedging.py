@@ -0,0 +1,105 @@
+"""Hedged retries for idempotent tools."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+class HedgePolicy:
+    """Launches a second attempt of a slow idempotent tool call and keeps whichever finishes first.
+
+    The hedge delay for each tool is the chosen percentile of its recent latencies, clamped to
+    ``[min_delay, max_delay]``. Until ``min_samples`` latencies are recorded ``max_delay`` is used.
+    """
+
+    def __init__(
+        self,
+        *,
+        percentile: float = 0.95,
+        window: int = 200,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        max_delay: float = 5.0,
+    ) -> None:
+        """Initialize the policy.
+
+        Args:
+            percentile: Latency percentile used as the hedge delay, between 0 and 1.
+            window: Number of recent latencies kept per tool.
+            min_samples: Latencies required before the percentile is trusted.
+            min_delay: Lower bound on the hedge delay in seconds.
+            max_delay: Upper bound on the hedge delay in seconds.
+        """
+        self.percentile = percentile
+        self.window = window
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._latencies: dict[str, deque[float]] = {}
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record the latency of a successful call."""
+        samples = self._latencies.get(name)
+        if samples is None:
+            samples = self._latencies[name] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def delay(self, name: str) -> float:
+        """Return how long to wait for the first attempt before hedging."""
+        samples = self._latencies.get(name)
+        if not samples or len(samples) < self.min_samples:
+            return self.max_delay
+        ordered = sorted(samples)
+        value = ordered[min(len(ordered) - 1, int(self.percentile * len(ordered)))]
+        return min(self.max_delay, max(self.min_delay, value))
+
+    async def run(self, name: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``attempt``, starting a second copy if the first exceeds the hedge delay.
+
+        The first attempt to finish decides the outcome, whether it returns or raises; the
+        other is cancelled. Calls already running on a thread pool cannot be interrupted and
+        run to completion in the background.
+
+        Args:
+            name: The tool name, used to look up and record latencies.
+            attempt: Zero-argument callable starting one attempt.
+
+        Returns:
+            The result of the winning attempt.
+        """
+
+        async def timed() -> tuple[float, Any]:
+            started = time.monotonic()
+            result = await attempt()
+            return time.monotonic() - started, result
+
+        first = asyncio.ensure_future(timed())
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.delay(name))
+            if not done:
+                self.hedged += 1
+                tasks.append(asyncio.ensure_future(timed()))
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+
+            winner = next(iter(done))
+            if winner is not first:
+                self.hedge_wins += 1
+            elapsed, result = winner.result()
+            self.record(name, elapsed)
+            return result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    with contextlib.suppress(BaseException):
+                        await task
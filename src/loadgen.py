@@ -0,0 +1,479 @@
+"""Open-loop load generator for soak testing an Agent."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+from dotenv import load_dotenv
+
+import travel_tools
+from agent import Agent
+from cli import load_tool
+from fake_live import CallTools, FakeClient, Text
+from metrics import Histogram
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from fake_live import Step
+
+# Prompt template and argument sets of each tool in :mod:`travel_tools`. A task asks one prompt per
+# tool drawn for it, and the fake backend answers it by calling those tools with those arguments.
+EXAMPLE_TOOLS: dict[str, tuple[str, tuple[dict[str, Any], ...]]] = {
+    "get_current_weather": (
+        "What is the weather in {location}?",
+        ({"location": "New York"}, {"location": "London"}, {"location": "Tokyo"}),
+    ),
+    "query_calendar": (
+        "What is on my calendar {date}?",
+        ({"date": "today"}, {"date": "tomorrow"}),
+    ),
+    "cancel_appointment": (
+        "Cancel appointment {appointment_id}.",
+        ({"appointment_id": 101}, {"appointment_id": 104}, {"appointment_id": 999}),
+    ),
+    "get_flight_options": (
+        "Find flights from {origin} to {destination} {date}.",
+        ({"origin": "San Francisco", "destination": "New York", "date": "today"}, {"origin": "New York", "destination": "London", "date": "today"}),
+    ),
+    "query_sqlite_hotels": (
+        "Find hotels in {city} rated at least {rating_min}.",
+        ({"city": "New York", "rating_min": "4"}, {"city": "London", "rating_min": "3"}),
+    ),
+    "query_loyalty_programs": (
+        "Which loyalty offers can I use in {destination}?",
+        ({"destination": "New York"}, {"destination": "London"}),
+    ),
+}
+
+# Latency buckets in seconds for the run summary, about 12% apart from 1 ms to 120 s
+LATENCY_BUCKETS: tuple[float, ...] = tuple(round(0.001 * 1.12**i, 6) for i in range(104))
+
+
+def parse_mix(specs: Sequence[str]) -> dict[str, float]:
+    """Parse ``name=weight`` tool mix entries, defaulting to an even mix of every travel tool.
+
+    Raises:
+        ValueError: If an entry names an unknown tool or has a negative or non-numeric weight.
+    """
+    if not specs:
+        return dict.fromkeys(EXAMPLE_TOOLS, 1.0)
+
+    mix: dict[str, float] = {}
+    for spec in specs:
+        name, _, weight = spec.partition("=")
+        if name not in EXAMPLE_TOOLS:
+            raise ValueError(f"Unknown tool {name!r} in tool mix, expected one of {', '.join(EXAMPLE_TOOLS)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Tool mix weight must be a number, got {spec!r}") from None
+        if mix[name] < 0:
+            raise ValueError(f"Tool mix weight must not be negative, got {spec!r}")
+    if not any(mix.values()):
+        raise ValueError("Tool mix needs at least one tool with a positive weight")
+    return mix
+
+
+def rss_bytes() -> int | None:
+    """Return the resident set size of this process, or ``None`` where ``/proc`` is unavailable."""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def open_sockets() -> int | None:
+    """Return the number of sockets this process has open, or ``None`` where ``/proc`` is unavailable."""
+    count = 0
+    try:
+        for fd in Path("/proc/self/fd").iterdir():
+            with contextlib.suppress(OSError):
+                count += str(fd.readlink()).startswith("socket:")
+    except OSError:
+        return None
+    return count
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values.sort()
+    return values[min(len(values) - 1, math.ceil(q * len(values)) - 1)]
+
+
+class TaskMix:
+    """Draws tasks asking for a weighted mix of the travel tools.
+
+    The calls planned for each task are kept until :meth:`done`, so :meth:`script` can serve as
+    the :class:`~fake_live.FakeClient` script answering the task with exactly those calls.
+    """
+
+    def __init__(self, mix: dict[str, float], *, calls_per_task: int = 1, seed: int | None = None) -> None:
+        """Initialize the mix.
+
+        Args:
+            mix: Relative weights of the tools, as returned by :func:`parse_mix`.
+            calls_per_task: Tools drawn for each task.
+            seed: Seed for the tool and argument draws.
+        """
+        self.tools = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.tools]
+        self.calls_per_task = calls_per_task
+        self.random = random.Random(seed)
+        self.plans: dict[str, list[tuple[str, dict[str, Any]]]] = {}
+        self._ids = itertools.count(1)
+
+    def next_task(self) -> str:
+        """Draw the tools of the next task and return its prompt."""
+        calls = []
+        prompts = []
+        for name in self.random.choices(self.tools, self.weights, k=self.calls_per_task):
+            template, arg_sets = EXAMPLE_TOOLS[name]
+            args = self.random.choice(arg_sets)
+            calls.append((name, args))
+            prompts.append(template.format(**args))
+        task = f"Request {next(self._ids)}: {' '.join(prompts)}"
+        self.plans[task] = calls
+        return task
+
+    def done(self, task: str) -> None:
+        """Forget the plan of a finished task."""
+        self.plans.pop(task, None)
+
+    def script(self, task: Any) -> list[Step]:
+        """Return the fake backend steps answering a task with the calls planned for it."""
+        calls = self.plans.get(task)
+        steps: list[Step] = [Text("Let me check.")]
+        if calls:
+            steps.append(CallTools(calls))
+        steps.append(Text("Here is what I found."))
+        return steps
+
+
+class LoadGenerator:
+    """Drives an agent with Poisson arrivals and samples the process while it runs.
+
+    Arrivals are scheduled at absolute times drawn from an exponential distribution, so a slow
+    agent or a stalled event loop does not slow the offered load, and latency is measured from
+    the scheduled arrival rather than the actual start. Arrivals beyond ``max_inflight`` are
+    dropped and counted. Every ``sample_interval`` seconds a sample of the window is passed to
+    ``on_sample``: arrivals, completions, errors, latency percentiles, the worst event loop lag
+    and the RSS and open sockets of the process.
+    """
+
+    def __init__(
+        self,
+        agent: Agent,
+        tasks: TaskMix,
+        *,
+        rps: float,
+        max_inflight: int = 1000,
+        sample_interval: float = 1.0,
+        lag_interval: float = 0.05,
+        seed: int | None = None,
+        on_sample: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        """Initialize the generator.
+
+        Args:
+            agent: The agent to run tasks on, with the tools of ``tasks`` added.
+            tasks: Draws the task of each arrival.
+            rps: Mean task arrivals per second.
+            max_inflight: Tasks allowed in flight before arrivals are dropped.
+            sample_interval: Seconds per sample.
+            lag_interval: Seconds between event loop lag probes.
+            seed: Seed for the arrival times.
+            on_sample: Receives each sample as it is taken.
+        """
+        self.agent = agent
+        self.tasks = tasks
+        self.rps = rps
+        self.max_inflight = max_inflight
+        self.sample_interval = sample_interval
+        self.lag_interval = lag_interval
+        self.random = random.Random(seed)
+        self.on_sample = on_sample
+        self.samples: list[dict[str, Any]] = []
+        self.inflight: set[asyncio.Task] = set()
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.latency_max = 0.0
+        self.warmup_until = 0.0
+        self.totals = {"arrivals": 0, "completed": 0, "errors": 0, "dropped": 0}
+        self._window = self._new_window()
+        self._window_started = 0.0
+        self._started = 0.0
+
+    @staticmethod
+    def _new_window() -> dict[str, Any]:
+        return {"arrivals": 0, "completed": 0, "errors": 0, "dropped": 0, "latencies": [], "loop_lag": 0.0}
+
+    async def _one(self, task: str, scheduled: float) -> None:
+        try:
+            await self.agent.run(task, enable_code_execution=False, raise_errors=True)
+        except (Exception, asyncio.CancelledError):
+            self._window["errors"] += 1
+            self.totals["errors"] += 1
+        finally:
+            self.tasks.done(task)
+        elapsed = time.perf_counter() - scheduled
+        window = self._window
+        window["completed"] += 1
+        window["latencies"].append(elapsed)
+        self.totals["completed"] += 1
+        if scheduled >= self.warmup_until:
+            self.latency.observe(elapsed)
+            self.latency_max = max(self.latency_max, elapsed)
+
+    def _arrive(self, scheduled: float) -> None:
+        self._window["arrivals"] += 1
+        self.totals["arrivals"] += 1
+        if len(self.inflight) >= self.max_inflight:
+            self._window["dropped"] += 1
+            self.totals["dropped"] += 1
+            return
+        task = asyncio.create_task(self._one(self.tasks.next_task(), scheduled))
+        self.inflight.add(task)
+        task.add_done_callback(self.inflight.discard)
+
+    async def _arrivals(self, duration: float) -> None:
+        end = self._started + duration
+        scheduled = self._started
+        while True:
+            scheduled += self.random.expovariate(self.rps)
+            if scheduled >= end:
+                return
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._arrive(scheduled)
+
+    async def _probe_lag(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, time.perf_counter() - started - self.lag_interval)
+            self._window["loop_lag"] = max(self._window["loop_lag"], lag)
+
+    def sample(self) -> dict[str, Any]:
+        """Close the current window and record its sample."""
+        window, self._window = self._window, self._new_window()
+        now = time.perf_counter()
+        started, self._window_started = self._window_started, now
+        latencies = window["latencies"]
+        rss = rss_bytes()
+        live = getattr(getattr(self.agent.client, "aio", None), "live", None)
+        sample = {
+            "t": round(now - self._started, 3),
+            "warmup": started < self.warmup_until,
+            "arrivals": window["arrivals"],
+            "completed": window["completed"],
+            "errors": window["errors"],
+            "dropped": window["dropped"],
+            "inflight": len(self.inflight),
+            "p50_ms": _percentile(latencies, 0.5) * 1000,
+            "p99_ms": _percentile(latencies, 0.99) * 1000,
+            "max_ms": max(latencies, default=0.0) * 1000,
+            "loop_lag_ms": window["loop_lag"] * 1000,
+            "rss_mib": rss / 2**20 if rss is not None else None,
+            "sockets": open_sockets(),
+            "sessions": getattr(live, "active", None),
+        }
+        self.samples.append(sample)
+        if self.on_sample is not None:
+            self.on_sample(sample)
+        return sample
+
+    async def _sampler(self) -> None:
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            self.sample()
+
+    async def run(self, duration: float, *, warmup: float = 0.0, drain_timeout: float = 30.0) -> dict[str, Any]:
+        """Offer load for ``duration`` seconds, wait for tasks in flight and return the summary.
+
+        Samples and latencies from tasks scheduled in the first ``warmup`` seconds are left out of
+        the summary. Tasks still running ``drain_timeout`` seconds after the last arrival are
+        cancelled and counted as errors. A last sample is taken after the agent is closed, so
+        sessions and sockets it leaks show up in the final values.
+        """
+        self._started = self._window_started = time.perf_counter()
+        self.warmup_until = self._started + warmup
+        background = [asyncio.create_task(self._probe_lag()), asyncio.create_task(self._sampler())]
+        try:
+            await self._arrivals(duration)
+            if self.inflight:
+                _, pending = await asyncio.wait(set(self.inflight), timeout=drain_timeout)
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.wait(pending)
+        finally:
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+            await self.agent.close()
+        self.sample()
+        return self.summary()
+
+    def summary(self) -> dict[str, Any]:
+        """Summarize the run after warmup.
+
+        Latency percentiles are bucket bounds of :data:`LATENCY_BUCKETS`, capped at the slowest
+        task; growth is measured from the first sample after warmup to the last.
+        """
+        measured = [sample for sample in self.samples if not sample["warmup"]] or self.samples[-1:]
+        first, last = measured[0], measured[-1]
+        totals = self.totals
+        elapsed = last["t"] if self.samples else 0.0
+
+        def growth(key: str) -> float | None:
+            return last[key] - first[key] if first[key] is not None and last[key] is not None else None
+
+        return {
+            **totals,
+            "seconds": elapsed,
+            "throughput": totals["completed"] / elapsed if elapsed else 0.0,
+            "error_rate": (totals["errors"] + totals["dropped"]) / totals["arrivals"] if totals["arrivals"] else 0.0,
+            "p50_ms": min(self.latency.quantile(0.5), self.latency_max) * 1000,
+            "p99_ms": min(self.latency.quantile(0.99), self.latency_max) * 1000,
+            "max_ms": self.latency_max * 1000,
+            "loop_lag_max_ms": max(sample["loop_lag_ms"] for sample in measured),
+            "rss_mib": last["rss_mib"],
+            "rss_growth_mib": growth("rss_mib"),
+            "sockets": last["sockets"],
+            "socket_growth": growth("sockets"),
+        }
+
+
+# Summary key, threshold flag and unit of each regression check
+THRESHOLDS: tuple[tuple[str, str, str], ...] = (
+    ("error_rate", "max_error_rate", ""),
+    ("p99_ms", "max_p99_ms", " ms"),
+    ("loop_lag_max_ms", "max_loop_lag_ms", " ms"),
+    ("rss_growth_mib", "max_rss_growth_mib", " MiB"),
+    ("socket_growth", "max_socket_growth", ""),
+)
+
+
+def check_thresholds(summary: dict[str, Any], limits: dict[str, float | None]) -> list[str]:
+    """Return a message for every summary value above its limit; unset limits are skipped."""
+    violations = []
+    for key, flag, unit in THRESHOLDS:
+        limit = limits.get(flag)
+        value = summary.get(key)
+        if limit is not None and value is not None and value > limit:
+            violations.append(f"{key} {value:.4g}{unit} exceeds {limit:g}{unit}")
+    return violations
+
+
+def build_client(backend: str, tasks: TaskMix, args: argparse.Namespace) -> Any:
+    """Return the client for a backend: ``fake``, ``live`` or a ``module:function`` client factory."""
+    if backend == "fake":
+        return FakeClient(tasks.script, latency=args.latency, jitter=args.jitter, connect_latency=args.connect_latency, seed=args.seed)
+    if backend == "live":
+        return None
+    return load_tool(backend)()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the load generator."""
+    parser = argparse.ArgumentParser(
+        prog="gemini-agent-loadgen",
+        description="Drive an agent at a fixed arrival rate and report latency, loop lag, RSS and sockets over time.",
+    )
+    parser.add_argument("--rps", type=float, default=10.0, help="Mean task arrivals per second (default: 10)")
+    parser.add_argument("-d", "--duration", type=float, default=60.0, help="Seconds of offered load (default: 60)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Seconds left out of the summary and growth baselines (default: 5)")
+    parser.add_argument("-b", "--backend", default="fake", help="fake, live or a MODULE:FUNCTION returning a client (default: fake)")
+    parser.add_argument("-m", "--model", default="gemini-2.0-flash-exp", help="Model to run the tasks with")
+    parser.add_argument("--tool-mix", action="append", default=[], metavar="TOOL=W", help="Weight of a travel_tools tool (repeatable)")
+    parser.add_argument("--calls-per-task", type=int, default=1, help="Tools each task asks for (default: 1)")
+    parser.add_argument("--pool-size", type=int, default=0, help="Keep up to this many Live sessions open between tasks")
+    parser.add_argument("--max-inflight", type=int, default=1000, help="Tasks in flight before arrivals are dropped (default: 1000)")
+    parser.add_argument("--drain-timeout", type=float, default=30.0, help="Seconds to wait for tasks in flight at the end (default: 30)")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds per time-series sample (default: 1)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake backend delay per server message in seconds (default: 0.05)")
+    parser.add_argument("--jitter", type=float, default=0.05, help="Fake backend random extra delay per message in seconds (default: 0.05)")
+    parser.add_argument("--connect-latency", type=float, default=0.1, help="Fake backend connect delay in seconds (default: 0.1)")
+    parser.add_argument("--seed", type=int, help="Seed for arrivals, tool draws and fake jitter")
+    parser.add_argument("-o", "--output", metavar="PATH", help="File to write the time series to as JSON lines, ending with the summary")
+    parser.add_argument("--max-error-rate", type=float, help="Fail if errors and drops exceed this fraction of arrivals")
+    parser.add_argument("--max-p99-ms", type=float, help="Fail if p99 latency after warmup exceeds this")
+    parser.add_argument("--max-loop-lag-ms", type=float, help="Fail if event loop lag after warmup exceeds this")
+    parser.add_argument("--max-rss-growth-mib", type=float, help="Fail if RSS grows by more than this after warmup")
+    parser.add_argument("--max-socket-growth", type=int, help="Fail if open sockets grow by more than this after warmup")
+    parser.add_argument("--no-dotenv", action="store_true", help="Don't load environment variables from a .env file")
+    return parser
+
+
+async def run_load(args: argparse.Namespace, output: TextIO | None) -> dict[str, Any]:
+    """Build the agent for parsed arguments, run the load and return the summary."""
+    mix = parse_mix(args.tool_mix)
+
+    def write(record: dict[str, Any]) -> None:
+        if output is not None:
+            output.write(json.dumps(record) + "\n")
+            output.flush()
+
+    tasks = TaskMix(mix, calls_per_task=args.calls_per_task, seed=args.seed)
+    agent = Agent(model=args.model, pool_size=args.pool_size, client=build_client(args.backend, tasks, args))
+    for name in tasks.tools:
+        agent.add_tool(getattr(travel_tools, name))
+
+    generator = LoadGenerator(
+        agent,
+        tasks,
+        rps=args.rps,
+        max_inflight=args.max_inflight,
+        sample_interval=args.sample_interval,
+        seed=args.seed,
+        on_sample=lambda sample: write({"kind": "sample", **sample}),
+    )
+    summary = await generator.run(args.duration, warmup=args.warmup, drain_timeout=args.drain_timeout)
+    write({"kind": "summary", **summary})
+    return summary
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the load generator CLI.
+
+    Returns:
+        ``0`` if every threshold held, ``1`` otherwise.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.rps <= 0 or args.duration <= 0 or args.calls_per_task < 1:
+        parser.error("--rps and --duration must be positive and --calls-per-task at least 1")
+    try:
+        parse_mix(args.tool_mix)
+    except ValueError as e:
+        parser.error(str(e))
+    if not args.no_dotenv:
+        load_dotenv()
+
+    with contextlib.ExitStack() as stack:
+        output = stack.enter_context(Path(args.output).open("w", encoding="utf-8")) if args.output else None
+        summary = asyncio.run(run_load(args, output))
+
+    print(json.dumps(summary, indent=2), file=sys.stderr)
+    violations = check_thresholds(summary, vars(args))
+    for violation in violations:
+        print(f"FAIL {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
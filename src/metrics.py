@@ -0,0 +1,206 @@
+"""Latency and throughput instrumentation hooks for Agent."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Any
+
+# Default histogram buckets in seconds, from 1 ms to 60 s
+DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Buckets for tool fan-out width
+FANOUT_BUCKETS: tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64)
+
+# Metric names recorded by Agent and SessionPool, with their help text
+METRICS: dict[str, str] = {
+    "agent_connect_seconds": "Time to obtain a Live session, including pool hits.",
+    "agent_ttft_seconds": "Time from sending a task to the first text chunk.",
+    "agent_turn_seconds": "Time from sending a task to turn completion.",
+    "agent_model_think_seconds": "Time from sending tool responses to the next server message.",
+    "agent_tool_seconds": "Wall time of one tool call.",
+    "agent_tool_calls_total": "Tool calls executed.",
+    "agent_tool_errors_total": "Tool calls that returned an error.",
+    "agent_tool_fanout": "Function calls per tool call message.",
+    "agent_bytes_sent_total": "Approximate bytes sent to the Live API.",
+    "agent_bytes_received_total": "Approximate bytes received from the Live API.",
+    "agent_sessions_total": "Sessions handed out, labelled by whether they were reused.",
+    "agent_errors_total": "Runs that failed with an exception.",
+    "agent_ratelimit_wait_seconds": "Time a connect or message waited for rate limiter admission.",
+    "agent_quota_errors_total": "Requests the API rejected for quota or rate reasons.",
+    "agent_response_cache_total": "Task response cache lookups, labelled hit, miss or bypass.",
+}
+
+
+def _label_key(labels: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Metrics hook interface.
+
+    The base class discards everything. Subclass it and override :meth:`observe` and
+    :meth:`increment` to forward measurements to another backend. Passing no metrics object to
+    :class:`~agent.Agent` skips instrumentation entirely.
+    """
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a sample in a histogram."""
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter."""
+
+
+class Histogram:
+    """Cumulative bucket histogram with a running sum and count."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initialize an empty histogram with the given upper bounds."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """Record one sample."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile as the upper bound of the bucket containing it."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts, strict=False):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+class InMemoryMetrics(Metrics):
+    """Keeps histograms and counters in memory and renders them in Prometheus text format."""
+
+    def __init__(self, buckets: dict[str, tuple[float, ...]] | None = None) -> None:
+        """Initialize empty metrics.
+
+        Args:
+            buckets: Histogram buckets per metric name, overriding :data:`DEFAULT_BUCKETS`.
+        """
+        self.buckets = {"agent_tool_fanout": FANOUT_BUCKETS, **(buckets or {})}
+        self.histograms: dict[str, dict[tuple[tuple[str, str], ...], Histogram]] = {}
+        self.counters: dict[str, dict[tuple[tuple[str, str], ...], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a sample in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets.get(name, DEFAULT_BUCKETS))
+            histogram.observe(value)
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def histogram(self, name: str, **labels: Any) -> Histogram | None:
+        """Return the histogram for a metric and label set, if any samples were recorded."""
+        return self.histograms.get(name, {}).get(_label_key(labels))
+
+    def counter(self, name: str, **labels: Any) -> float:
+        """Return the value of a counter for a label set."""
+        return self.counters.get(name, {}).get(_label_key(labels), 0)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Summarize every histogram series with its count, mean, p50 and p99."""
+        result = {}
+        with self._lock:
+            for name, series in self.histograms.items():
+                for key, histogram in series.items():
+                    label = name + ("{" + ",".join(f"{k}={v}" for k, v in key) + "}" if key else "")
+                    result[label] = {
+                        "count": histogram.count,
+                        "mean": histogram.sum / histogram.count if histogram.count else 0.0,
+                        "p50": histogram.quantile(0.5),
+                        "p99": histogram.quantile(0.99),
+                    }
+        return result
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+
+        def labels_text(key: tuple[tuple[str, str], ...], extra: tuple[tuple[str, str], ...] = ()) -> str:
+            pairs = key + extra
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# HELP {name} {METRICS.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{labels_text(key)} {value:g}" for key, value in sorted(series.items()))
+
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# HELP {name} {METRICS.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts, strict=False):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{labels_text(key, (('le', f'{bound:g}'),))} {cumulative}")
+                    lines.append(f"{name}_bucket{labels_text(key, (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{labels_text(key)} {histogram.sum:g}")
+                    lines.append(f"{name}_count{labels_text(key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+class OpenTelemetryMetrics(Metrics):
+    """Forwards measurements to OpenTelemetry histograms and counters.
+
+    Requires the optional ``opentelemetry-api`` package.
+    """
+
+    def __init__(self, meter_name: str = "gemini-agent", meter_provider: Any = None) -> None:
+        """Initialize with a meter from the given or global meter provider.
+
+        Raises:
+            ImportError: If ``opentelemetry-api`` is not installed.
+        """
+        try:
+            from opentelemetry import metrics as otel_metrics
+        except ImportError as e:
+            raise ImportError("OpenTelemetryMetrics requires the opentelemetry-api package") from e
+
+        provider = meter_provider or otel_metrics.get_meter_provider()
+        self.meter = provider.get_meter(meter_name)
+        self._instruments: dict[str, Any] = {}
+
+    def _instrument(self, name: str, kind: str) -> Any:
+        instrument = self._instruments.get(name)
+        if instrument is None:
+            create = self.meter.create_histogram if kind == "histogram" else self.meter.create_counter
+            instrument = self._instruments[name] = create(name, description=METRICS.get(name, ""))
+        return instrument
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record a sample in an OpenTelemetry histogram."""
+        self._instrument(name, "histogram").record(value, attributes=labels)
+
+    def increment(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Add to an OpenTelemetry counter."""
+        self._instrument(name, "counter").add(value, attributes=labels)
@@ -0,0 +1,304 @@
+"""Pool of warm Live API sessions keyed by their effective connect config."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import time
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from google import genai
+    from google.genai import live, types
+
+    from metrics import Metrics
+
+
+def config_key(model: str, config: dict | types.LiveConnectConfig, tenant: str | None = None) -> str:
+    """Build a stable key for a model, Live connect config and tenant.
+
+    Args:
+        model: The model name the session is opened for.
+        config: The connect config passed to ``client.aio.live.connect``.
+        tenant: Tenant the session is reserved for, if any.
+
+    Returns:
+        A canonical JSON string identifying the effective session config.
+    """
+
+    def _default(value: Any) -> Any:
+        if hasattr(value, "model_dump"):
+            return value.model_dump(mode="json", exclude_none=True)
+        return repr(value)
+
+    return json.dumps({"model": model, "config": config, "tenant": tenant}, sort_keys=True, default=_default)
+
+
+class PooledSession:
+    """A Live session held open by a :class:`SessionPool`."""
+
+    def __init__(self, key: str, session: live.AsyncSession, stack: contextlib.AsyncExitStack) -> None:
+        """Wrap an open session together with the exit stack that closes it."""
+        self.key = key
+        self.session = session
+        self.stack = stack
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+        # Whether the last acquire took the session from the idle list rather than opening it
+        self.warm = False
+
+
+class SessionPool:
+    """Keeps Live sessions open between tasks so each task skips the connect handshake.
+
+    Sessions are grouped by :func:`config_key`; a session is only ever handed to a task of the
+    same tenant whose model, tools, modalities and system instruction match the ones it was
+    opened with. The pool caps the number of open sessions, closes sessions that sat idle longer
+    than ``idle_timeout`` and drops sessions that were released as broken.
+
+    A reused session keeps the server-side context of the turns it already served, so later
+    tasks can see the prompts and tool results of earlier ones and the context keeps growing.
+    Each session is therefore closed after serving ``max_uses`` tasks; ``max_uses=1`` keeps
+    tasks fully isolated while still letting :meth:`prewarm` open sessions ahead of time.
+    """
+
+    def __init__(
+        self,
+        client: genai.Client,
+        *,
+        max_size: int = 4,
+        idle_timeout: float = 300.0,
+        max_uses: int | None = 8,
+        metrics: Metrics | None = None,
+    ) -> None:
+        """Initialize an empty pool.
+
+        Args:
+            client: The client used to open new Live sessions.
+            max_size: Maximum number of sessions open at once, idle or in use.
+            idle_timeout: Seconds an idle session may stay open before it is closed.
+            max_uses: Tasks a session serves before it is closed, or ``None`` for no limit.
+            metrics: Hook counting sessions handed out, labelled by whether they were reused.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_uses is not None and max_uses < 1:
+            raise ValueError("max_uses must be at least 1")
+
+        self.client = client
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_uses = max_uses
+        self.metrics = metrics
+        self._idle: dict[str, list[PooledSession]] = {}
+        self._keys: dict[tuple[int, str | None], tuple[object, str, str]] = {}
+        self._open = 0
+        self._condition = asyncio.Condition()
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Number of sessions currently open, idle or in use."""
+        return self._open
+
+    @property
+    def idle_count(self) -> int:
+        """Number of open sessions waiting to be handed out."""
+        return sum(len(sessions) for sessions in self._idle.values())
+
+    def _key(self, model: str, config: object, tenant: str | None = None) -> str:
+        """Return :func:`config_key` for a config, memoized for configs reused across tasks."""
+        entry = self._keys.get((id(config), tenant))
+        if entry is not None and entry[0] is config and entry[1] == model:
+            return entry[2]
+        if len(self._keys) >= 64:
+            self._keys.clear()
+        key = config_key(model, config, tenant)
+        self._keys[(id(config), tenant)] = (config, model, key)
+        return key
+
+    async def _connect(self, key: str, model: str, config: dict | types.LiveConnectConfig) -> PooledSession:
+        stack = contextlib.AsyncExitStack()
+        try:
+            session = await stack.enter_async_context(self.client.aio.live.connect(model=model, config=config))
+        except BaseException:
+            await stack.aclose()
+            raise
+        return PooledSession(key, session, stack)
+
+    async def _discard(self, pooled: PooledSession) -> None:
+        with contextlib.suppress(Exception):
+            await pooled.stack.aclose()
+
+    def _take_expired(self) -> list[PooledSession]:
+        now = time.monotonic()
+        expired = []
+        for key, sessions in list(self._idle.items()):
+            fresh = [pooled for pooled in sessions if now - pooled.last_used < self.idle_timeout]
+            expired.extend(pooled for pooled in sessions if now - pooled.last_used >= self.idle_timeout)
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+        self._open -= len(expired)
+        return expired
+
+    def _take_oldest_idle(self) -> PooledSession | None:
+        candidates = [pooled for sessions in self._idle.values() for pooled in sessions]
+        if not candidates:
+            return None
+        oldest = min(candidates, key=lambda pooled: pooled.last_used)
+        self._idle[oldest.key].remove(oldest)
+        if not self._idle[oldest.key]:
+            del self._idle[oldest.key]
+        self._open -= 1
+        return oldest
+
+    async def acquire(
+        self,
+        model: str,
+        config: dict | types.LiveConnectConfig,
+        *,
+        tenant: str | None = None,
+        fresh: bool = False,
+        before_connect: Callable[[], Awaitable[None]] | None = None,
+    ) -> PooledSession:
+        """Hand out a warm session for the config and tenant, opening one if none is idle.
+
+        Waits while the pool is full and every open session is in use. When the pool is full
+        but other sessions are idle, the least recently used one is closed to make room.
+        ``fresh`` always opens a new socket, e.g. after a warm one turned out to be dropped.
+        ``before_connect`` is awaited only when a new socket has to be opened, e.g. for rate limiting.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        key = self._key(model, config, tenant)
+        stale: list[PooledSession] = []
+
+        async with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Session pool is closed")
+
+                stale.extend(self._take_expired())
+                if not fresh and (sessions := self._idle.get(key)):
+                    pooled = sessions.pop()
+                    if not sessions:
+                        del self._idle[key]
+                    warm = True
+                    break
+
+                if self._open >= self.max_size and (victim := self._take_oldest_idle()):
+                    stale.append(victim)
+
+                if self._open < self.max_size:
+                    self._open += 1
+                    pooled = None
+                    warm = False
+                    break
+
+                await self._condition.wait()
+
+        for victim in stale:
+            await self._discard(victim)
+
+        if pooled is None:
+            try:
+                if before_connect is not None:
+                    await before_connect()
+                pooled = await self._connect(key, model, config)
+            except BaseException:
+                async with self._condition:
+                    self._open -= 1
+                    self._condition.notify()
+                raise
+
+        pooled.warm = warm
+        pooled.uses += 1
+        if self.metrics is not None:
+            self.metrics.increment("agent_sessions_total", reused="true" if pooled.uses > 1 else "false")
+        return pooled
+
+    async def release(self, pooled: PooledSession, *, broken: bool = False) -> None:
+        """Return a session to the pool, or close it if it is broken, used up or the pool is closed."""
+        async with self._condition:
+            keep = not broken and not self._closed and (self.max_uses is None or pooled.uses < self.max_uses)
+            if keep:
+                pooled.last_used = time.monotonic()
+                self._idle.setdefault(pooled.key, []).append(pooled)
+            else:
+                self._open -= 1
+            self._condition.notify()
+
+        if not keep:
+            await self._discard(pooled)
+
+    @contextlib.asynccontextmanager
+    async def session(
+        self,
+        model: str,
+        config: dict | types.LiveConnectConfig,
+        *,
+        tenant: str | None = None,
+        before_connect: Callable[[], Awaitable[None]] | None = None,
+    ) -> AsyncIterator[live.AsyncSession]:
+        """Borrow a session for the duration of the block.
+
+        The session is returned to the pool when the block exits normally and closed when
+        the block raises or is cancelled, since the socket may be left mid-turn.
+        """
+        pooled = await self.acquire(model, config, tenant=tenant, before_connect=before_connect)
+        broken = True
+        try:
+            yield pooled.session
+            broken = False
+        finally:
+            await self.release(pooled, broken=broken)
+
+    async def prewarm(self, model: str, config: dict | types.LiveConnectConfig, count: int = 1, *, tenant: str | None = None) -> int:
+        """Open up to ``count`` idle sessions for the config and tenant ahead of the first task.
+
+        Returns:
+            The number of sessions opened.
+        """
+        key = self._key(model, config, tenant)
+        opened = 0
+
+        for _ in range(count):
+            async with self._condition:
+                if self._closed or self._open >= self.max_size:
+                    break
+                self._open += 1
+
+            try:
+                pooled = await self._connect(key, model, config)
+            except BaseException:
+                async with self._condition:
+                    self._open -= 1
+                    self._condition.notify()
+                raise
+
+            await self.release(pooled)
+            opened += 1
+
+        return opened
+
+    async def close(self) -> None:
+        """Close every idle session and stop handing out new ones.
+
+        Sessions still in use are closed when they are released.
+        """
+        async with self._condition:
+            self._closed = True
+            idle = [pooled for sessions in self._idle.values() for pooled in sessions]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._condition.notify_all()
+
+        for pooled in idle:
+            await self._discard(pooled)
@@ -0,0 +1,158 @@
+"""Speculative prefetch of read-only tools."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from cache import make_key
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+
+@dataclass(frozen=True)
+class PrefetchRule:
+    """Predicts a read-only tool call from the task or from an earlier call.
+
+    Attributes:
+        tool: The read-only tool to prefetch.
+        after: The tool whose call triggers the prefetch, or ``None`` to trigger on the task
+            itself, in which case ``args`` maps from ``{"task": task_text}``.
+        args: Arguments of the prefetched call. Either a mapping from its parameter names to
+            parameter names of the triggering call, or a function of the triggering call's
+            arguments returning the arguments, or ``None`` to skip the prefetch.
+    """
+
+    tool: str
+    after: str | None = None
+    args: dict[str, str] | Callable[[dict[str, Any]], dict[str, Any] | None] | None = None
+
+    def predict(self, source: dict[str, Any]) -> dict[str, Any] | None:
+        """Return the arguments of the predicted call, or ``None`` if nothing should be prefetched."""
+        if self.args is None:
+            return {}
+        if callable(self.args):
+            return self.args(source)
+        if any(name not in source for name in self.args.values()):
+            return None
+        return {param: source[name] for param, name in self.args.items()}
+
+
+class Prefetcher:
+    """Starts predicted read-only tool calls early and parks their results for the real call.
+
+    A parked result is consumed at most once, by the first real call of the same tool with equal
+    arguments within ``ttl`` seconds. Results that expire or are evicted unconsumed count as
+    wasted work.
+    """
+
+    def __init__(self, rules: Iterable[PrefetchRule], *, ttl: float = 30.0, max_entries: int = 256) -> None:
+        """Initialize the prefetcher.
+
+        Args:
+            rules: The prefetch rules.
+            ttl: Seconds a parked result may wait for the real call.
+            max_entries: Maximum number of parked results.
+        """
+        self.rules: dict[str | None, list[PrefetchRule]] = {}
+        for rule in rules:
+            self.rules.setdefault(rule.after, []).append(rule)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._parked: OrderedDict[str, tuple[float, asyncio.Task[tuple[dict, float]]]] = OrderedDict()
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self.wasted_seconds = 0.0
+
+    def trigger(
+        self,
+        after: str | None,
+        source: dict[str, Any],
+        run: Callable[[str, dict[str, Any]], Awaitable[dict]],
+        *,
+        allowed: Callable[[str], bool] | None = None,
+    ) -> int:
+        """Start the prefetches predicted by a task or a tool call.
+
+        Args:
+            after: The called tool, or ``None`` for the start of a task.
+            source: The call's arguments, or ``{"task": task_text}``.
+            run: Executes a tool call and returns its response.
+            allowed: Whether a tool may be prefetched, i.e. it is registered as read-only.
+
+        Returns:
+            The number of prefetches started.
+        """
+        started = 0
+        now = time.monotonic()
+        self._expire(now)
+        for rule in self.rules.get(after, ()):
+            if allowed is not None and not allowed(rule.tool):
+                continue
+            args = rule.predict(source)
+            if args is None:
+                continue
+            key = make_key(rule.tool, args)
+            if key in self._parked:
+                continue
+
+            self._parked[key] = (now + self.ttl, asyncio.ensure_future(self._timed(run(rule.tool, args))))
+            self.started += 1
+            started += 1
+
+        while len(self._parked) > self.max_entries:
+            self._discard(next(iter(self._parked)))
+        return started
+
+    @staticmethod
+    async def _timed(call: Awaitable[dict]) -> tuple[dict, float]:
+        started = time.perf_counter()
+        response = await call
+        return response, time.perf_counter() - started
+
+    def take(self, name: str, args: dict[str, Any] | None) -> asyncio.Task[tuple[dict, float]] | None:
+        """Hand the parked prefetch of a call to the real call, or return ``None`` on a miss."""
+        self._expire(time.monotonic())
+        entry = self._parked.pop(make_key(name, args), None)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def _discard(self, key: str) -> None:
+        _, task = self._parked.pop(key)
+        self.wasted += 1
+        if task.done():
+            if not task.cancelled() and task.exception() is None:
+                self.wasted_seconds += task.result()[1]
+        else:
+            task.cancel()
+
+    def _expire(self, now: float) -> None:
+        for key in [key for key, (expires_at, _) in self._parked.items() if expires_at <= now]:
+            self._discard(key)
+
+    def close(self) -> None:
+        """Cancel in-flight prefetches and drop every parked result."""
+        for key in list(self._parked):
+            self._discard(key)
+
+    def stats(self) -> dict[str, float]:
+        """Return started, hit, miss and wasted counters, the hit rate and seconds of wasted tool time."""
+        lookups = self.hits + self.misses
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "wasted": self.wasted,
+            "wasted_seconds": self.wasted_seconds,
+            "parked": len(self._parked),
+        }
@@ -0,0 +1,313 @@
+"""Opt-in profiling of tool dispatch."""
+
+from __future__ import annotations
+
+import cProfile
+import heapq
+import inspect
+import itertools
+import json
+import pstats
+import random
+import threading
+import time
+import types as types_module
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from metrics import DEFAULT_BUCKETS, Histogram
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+
+    from utils import ToolOptions
+
+# Buckets for argument and result sizes in bytes, from 64 B to 4 MiB
+BYTE_BUCKETS: tuple[float, ...] = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Frames deeper than this are folded into their parent in collapsed stacks
+MAX_STACK_DEPTH = 64
+
+# Only one cProfile profiler can be active at a time on Python 3.12+, so sampled steps take turns.
+_PROFILING = threading.Lock()
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str).encode())
+
+
+def _frame_label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    label = name if filename == "~" else f"{name} ({Path(filename).name}:{line})"
+    return label.replace(";", ":")
+
+
+def _is_driver_frame(func: tuple[str, int, str]) -> bool:
+    # The coroutine send and throw calls made by CallSample._drive for each step
+    return func[0] == "~" and func[2] in ("<method 'send' of 'coroutine' objects>", "<method 'throw' of 'coroutine' objects>")
+
+
+def _is_profiler_frame(func: tuple[str, int, str]) -> bool:
+    filename, _, name = func
+    return filename == __file__ or (filename == "~" and ("_lsprof.Profiler" in name or "time.thread_time" in name))
+
+
+class CallSample:
+    """Measurements of one tool call in flight.
+
+    The wrapped tool adds the CPU time of every step it runs, on whichever thread runs it, and
+    records the steps under :mod:`cProfile` when the call was sampled.
+    """
+
+    __slots__ = ("arg_bytes", "cpu", "name", "profile", "profiled")
+
+    def __init__(self, name: str, arg_bytes: int, profile: bool) -> None:
+        """Start measuring a call of the named tool."""
+        self.name = name
+        self.arg_bytes = arg_bytes
+        self.cpu: float | None = None
+        self.profile = cProfile.Profile() if profile else None
+        self.profiled = False
+
+    def _begin(self) -> tuple[float, bool]:
+        profiling = self.profile is not None and _PROFILING.acquire(blocking=False)
+        if profiling:
+            self.profiled = True
+            self.profile.enable()
+        return time.thread_time(), profiling
+
+    def _end(self, token: tuple[float, bool]) -> None:
+        started, profiling = token
+        if profiling:
+            self.profile.disable()
+            _PROFILING.release()
+        self.cpu = (self.cpu or 0.0) + time.thread_time() - started
+
+    def wrap(self, tool: Callable, options: ToolOptions | None = None) -> Callable:
+        """Return ``tool`` wrapped to record CPU time and stacks.
+
+        Generator tools and tools run on the process pool are returned unchanged, so only their
+        wall time and sizes are recorded.
+        """
+        if options is not None and (options.cpu_bound or options.streaming):
+            return tool
+
+        if inspect.iscoroutinefunction(tool):
+
+            async def run_async(**kwargs: Any) -> Any:
+                return await self._drive(tool(**kwargs))
+
+            return run_async
+
+        def run(**kwargs: Any) -> Any:
+            token = self._begin()
+            try:
+                return tool(**kwargs)
+            finally:
+                self._end(token)
+
+        return run
+
+    @types_module.coroutine
+    def _drive(self, coro: Any) -> Any:
+        """Run a coroutine step by step, measuring each step on the event loop thread."""
+        value: Any = None
+        error: BaseException | None = None
+        try:
+            while True:
+                token = self._begin()
+                try:
+                    yielded = coro.throw(error) if error is not None else coro.send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    self._end(token)
+                try:
+                    value, error = (yield yielded), None
+                except BaseException as e:
+                    value, error = None, e
+        finally:
+            coro.close()
+
+
+class ToolStats:
+    """Aggregated measurements of one tool."""
+
+    __slots__ = ("arg_bytes", "calls", "cpu", "cpu_calls", "errors", "name", "result_bytes", "slowest", "wall", "wall_max")
+
+    def __init__(self, name: str) -> None:
+        """Initialize empty statistics for the named tool."""
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.wall = Histogram(DEFAULT_BUCKETS)
+        self.wall_max = 0.0
+        self.cpu = 0.0
+        self.cpu_calls = 0
+        self.arg_bytes = Histogram(BYTE_BUCKETS)
+        self.result_bytes = Histogram(BYTE_BUCKETS)
+        self.slowest: list[tuple[float, int, dict]] = []
+
+    def as_dict(self) -> dict[str, Any]:
+        """Summarize the statistics."""
+        return {
+            "tool": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "wall_seconds": self.wall.sum,
+            "wall_mean": self.wall.sum / self.calls if self.calls else 0.0,
+            "wall_p50": self.wall.quantile(0.5),
+            "wall_p99": self.wall.quantile(0.99),
+            "wall_max": self.wall_max,
+            "cpu_seconds": self.cpu,
+            "cpu_share": self.cpu / self.wall.sum if self.cpu_calls and self.wall.sum else None,
+            "arg_bytes_p50": self.arg_bytes.quantile(0.5),
+            "arg_bytes_max_bucket": self.arg_bytes.quantile(1.0),
+            "result_bytes_p50": self.result_bytes.quantile(0.5),
+            "result_bytes_p99": self.result_bytes.quantile(0.99),
+            "result_bytes_mean": self.result_bytes.sum / self.calls if self.calls else 0.0,
+            "profiled_calls": len(self.slowest),
+        }
+
+
+class ToolProfiler:
+    """Records per-tool call counts, argument and result sizes, wall and CPU time.
+
+    A fraction ``sample_rate`` of calls also runs under :mod:`cProfile`, and the stacks of the
+    ``keep_slowest`` slowest sampled calls of each tool are kept for :meth:`collapsed_stacks`.
+    Pass one to ``Agent(..., profiler=...)``; it may be shared by several agents.
+    """
+
+    def __init__(self, *, sample_rate: float = 0.0, keep_slowest: int = 5, seed: int | None = None) -> None:
+        """Initialize an empty profile.
+
+        Args:
+            sample_rate: Fraction of calls profiled with :mod:`cProfile`, from ``0`` to ``1``.
+            keep_slowest: Profiled calls kept per tool, slowest first.
+            seed: Seed for choosing the sampled calls.
+        """
+        self.sample_rate = sample_rate
+        self.keep_slowest = keep_slowest
+        self.random = random.Random(seed)
+        self.tools: dict[str, ToolStats] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def start(self, name: str, args: dict[str, Any] | None) -> CallSample:
+        """Start measuring a call, deciding whether it is profiled."""
+        profile = self.sample_rate > 0 and self.random.random() < self.sample_rate
+        return CallSample(name, _json_size(args or {}), profile)
+
+    def finish(self, sample: CallSample, response: dict[str, Any], wall: float) -> None:
+        """Record a finished call with the response sent to the model and its wall time."""
+        result_bytes = _json_size(response)
+        stacks = pstats.Stats(sample.profile).stats if sample.profiled else None
+
+        with self._lock:
+            stats = self.tools.get(sample.name)
+            if stats is None:
+                stats = self.tools[sample.name] = ToolStats(sample.name)
+            stats.calls += 1
+            stats.errors += "error" in response
+            stats.wall.observe(wall)
+            stats.wall_max = max(stats.wall_max, wall)
+            if sample.cpu is not None:
+                stats.cpu += sample.cpu
+                stats.cpu_calls += 1
+            stats.arg_bytes.observe(sample.arg_bytes)
+            stats.result_bytes.observe(result_bytes)
+            if stacks and self.keep_slowest > 0:
+                entry = (wall, next(self._seq), stacks)
+                if len(stats.slowest) < self.keep_slowest:
+                    heapq.heappush(stats.slowest, entry)
+                else:
+                    heapq.heappushpop(stats.slowest, entry)
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self.tools.clear()
+
+    def report(self) -> list[dict[str, Any]]:
+        """Summarize every tool, the ones taking the most wall time first."""
+        with self._lock:
+            rows = [stats.as_dict() for stats in self.tools.values()]
+        total = sum(row["wall_seconds"] for row in rows)
+        for row in rows:
+            row["wall_share"] = row["wall_seconds"] / total if total else 0.0
+        return sorted(rows, key=lambda row: row["wall_seconds"], reverse=True)
+
+    def format_table(self) -> str:
+        """Render :meth:`report` as a plain-text table.
+
+        Latency and size percentiles are histogram bucket bounds.
+        """
+        header = (
+            f"{'tool':<28}{'calls':>7}{'err':>5}{'wall s':>9}{'share':>7}{'mean ms':>9}{'p99 ms':>8}{'cpu %':>7}"
+            f"{'args p50':>9}{'result p50':>11}{'p99':>9}"
+        )
+        lines = [header, "-" * len(header)]
+        for row in self.report():
+            cpu = f"{row['cpu_share'] * 100:6.0f}%" if row["cpu_share"] is not None else f"{'-':>7}"
+            lines.append(
+                f"{row['tool'][:27]:<28}{row['calls']:>7}{row['errors']:>5}{row['wall_seconds']:>9.3f}{row['wall_share'] * 100:>6.1f}%"
+                f"{row['wall_mean'] * 1000:>9.2f}{row['wall_p99'] * 1000:>8.0f}{cpu}"
+                f"{_format_bytes(row['arg_bytes_p50']):>9}{_format_bytes(row['result_bytes_p50']):>11}{_format_bytes(row['result_bytes_p99']):>9}"
+            )
+        return "\n".join(lines)
+
+    def collapsed_stacks(self) -> list[str]:
+        """Return the sampled stacks in collapsed format, one ``tool;frame;...;frame microseconds`` line each.
+
+        The output can be fed to ``flamegraph.pl`` or speedscope. cProfile records caller and
+        callee pairs rather than whole stacks, so time is split between the callers of a
+        function in proportion to the time each call edge took.
+        """
+        folded: dict[str, float] = defaultdict(float)
+        with self._lock:
+            profiles = [(stats.name, stacks) for stats in self.tools.values() for _, _, stacks in stats.slowest]
+        for name, stacks in profiles:
+            _fold(stacks, name.replace(";", ":"), folded)
+        return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in sorted(folded.items()) if round(seconds * 1e6) > 0]
+
+    def write_collapsed(self, path: str | os.PathLike[str]) -> int:
+        """Write :meth:`collapsed_stacks` to a file and return the number of stacks written."""
+        lines = self.collapsed_stacks()
+        Path(path).write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+        return len(lines)
+
+
+def _format_bytes(value: float) -> str:
+    if value == float("inf"):
+        return "inf"
+    for unit in ("B", "K", "M"):
+        if value < 1024:
+            return f"{value:.0f}{unit}"
+        value /= 1024
+    return f"{value:.0f}G"
+
+
+def _fold(stacks: dict, prefix: str, folded: dict[str, float]) -> None:
+    """Add the call tree of one cProfile run to ``folded``, keyed by collapsed stack."""
+    children: dict[tuple, list[tuple[tuple, float]]] = defaultdict(list)
+    for func, (_, _, _, _, callers) in stacks.items():
+        for caller, edge in callers.items():
+            children[caller].append((func, edge[3]))
+
+    def walk(func: tuple, cumulative: float, stack: str, path: frozenset, depth: int) -> None:
+        _, _, own, total, _ = stacks[func]
+        ratio = cumulative / total if total else 0.0
+        if not _is_driver_frame(func):
+            stack = f"{stack};{_frame_label(func)}"
+        folded[stack] += own * ratio
+        if depth >= MAX_STACK_DEPTH:
+            return
+        for callee, edge_total in children.get(func, ()):
+            if callee not in path and not _is_profiler_frame(callee):
+                walk(callee, edge_total * ratio, stack, path | {callee}, depth + 1)
+
+    for func, (_, _, _, total, callers) in stacks.items():
+        if not callers and not _is_profiler_frame(func):
+            walk(func, total, prefix, frozenset({func}), 0)
@@ -0,0 +1,295 @@
+"""Shared rate limiting and admission control for Live API connects and messages."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import random
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from google.genai import live
+
+    from metrics import Metrics
+
+Priority = Literal["interactive", "batch"]
+Kind = Literal["connect", "message"]
+
+PRIORITIES: dict[str, int] = {"interactive": 0, "batch": 1}
+
+_QUOTA_MARKERS = ("RESOURCE_EXHAUSTED", "quota", "rate limit")
+
+
+def is_quota_error(error: BaseException) -> bool:
+    """Whether an error means the API rejected the request for quota or rate reasons."""
+    from google.genai import errors
+    from websockets.exceptions import ConnectionClosed
+
+    if isinstance(error, errors.APIError):
+        return error.code == 429 or error.status == "RESOURCE_EXHAUSTED"
+    if isinstance(error, ConnectionClosed) and error.rcvd is not None:
+        return any(marker.lower() in (error.rcvd.reason or "").lower() for marker in _QUOTA_MARKERS)
+    return False
+
+
+class TokenBucket:
+    """Token bucket whose rate can be lowered while the API is pushing back."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Maximum number of tokens held.
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """Add the tokens accrued since the last refill."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available."""
+        self.refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+
+class _Waiter:
+    __slots__ = ("enqueued", "future", "priority", "tenant")
+
+    def __init__(self, future: asyncio.Future[None], priority: str, tenant: str) -> None:
+        self.future = future
+        self.priority = priority
+        self.tenant = tenant
+        self.enqueued = time.monotonic()
+
+
+class _Lane:
+    """Admission queue in front of one bucket.
+
+    Waiters are ordered by priority, then by a start-time fair queuing tag per tenant so one
+    tenant's burst cannot starve the others at the same priority.
+    """
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self.bucket = bucket
+        self.heap: list[tuple[int, float, int, _Waiter]] = []
+        self.tenant_tags: dict[str, float] = {}
+        self.clock = 0.0
+        self.paused_until = 0.0
+        self.backoff = 0.0
+        self.timer: asyncio.TimerHandle | None = None
+        self.waits: deque[float] = deque(maxlen=1000)
+        self.admitted = 0
+
+    def depth(self) -> dict[str, int]:
+        counts = dict.fromkeys(PRIORITIES, 0)
+        for _, _, _, waiter in self.heap:
+            if not waiter.future.done():
+                counts[waiter.priority] += 1
+        return counts
+
+
+class RateLimiter:
+    """Token buckets for connects and messages per model, shared by any number of agents.
+
+    Callers wait in an admission queue per model and kind: ``interactive`` requests go ahead of
+    ``batch`` ones, and tenants at the same priority are served in turn. When the API reports a
+    quota error, :meth:`report_quota_error` pauses the model's queues with exponential backoff
+    and halves their rates; :meth:`report_success` restores the rates gradually. Queue depth and
+    wait times are available from :meth:`stats` for autoscaling.
+    """
+
+    def __init__(
+        self,
+        *,
+        connects_per_second: float = 5.0,
+        connect_burst: float = 10.0,
+        messages_per_second: float = 50.0,
+        message_burst: float = 100.0,
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_retries: int = 3,
+        tenant_weights: dict[str, float] | None = None,
+        metrics: Metrics | None = None,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            connects_per_second: Sustained session connects per second per model.
+            connect_burst: Connects allowed back to back per model.
+            messages_per_second: Sustained client messages per second per model.
+            message_burst: Messages allowed back to back per model.
+            min_backoff: First pause in seconds after a quota error.
+            max_backoff: Longest pause in seconds after repeated quota errors.
+            max_retries: Times an agent retries a task that failed with a quota error.
+            tenant_weights: Relative share of each tenant; tenants not listed weigh ``1``.
+            metrics: Hook receiving admission wait times and quota errors.
+        """
+        self.limits: dict[str, tuple[float, float]] = {
+            "connect": (connects_per_second, connect_burst),
+            "message": (messages_per_second, message_burst),
+        }
+        self.model_limits: dict[tuple[str, str], tuple[float, float]] = {}
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.tenant_weights = tenant_weights or {}
+        self.metrics = metrics
+        self._lanes: dict[tuple[str, str], _Lane] = {}
+        self._seq = itertools.count()
+        self.quota_errors = 0
+
+    def set_limits(self, model: str, kind: Kind, rate: float, burst: float) -> None:
+        """Override the rate and burst of one model's connects or messages."""
+        self.model_limits[(model, kind)] = (rate, burst)
+        if lane := self._lanes.get((model, kind)):
+            lane.bucket.max_rate = lane.bucket.rate = rate
+            lane.bucket.burst = burst
+
+    def _lane(self, model: str, kind: str) -> _Lane:
+        lane = self._lanes.get((model, kind))
+        if lane is None:
+            rate, burst = self.model_limits.get((model, kind), self.limits[kind])
+            lane = self._lanes[(model, kind)] = _Lane(TokenBucket(rate, burst))
+        return lane
+
+    async def acquire(self, model: str, kind: Kind, *, priority: Priority = "interactive", tenant: str = "default") -> float:
+        """Wait for admission and take one token.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        lane = self._lane(model, kind)
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        waiter = _Waiter(future, priority, tenant)
+
+        start_tag = max(lane.clock, lane.tenant_tags.get(tenant, 0.0))
+        lane.tenant_tags[tenant] = start_tag + 1 / self.tenant_weights.get(tenant, 1.0)
+        heapq.heappush(lane.heap, (PRIORITIES[priority], start_tag, next(self._seq), waiter))
+        self._pump(lane)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the caller gave up; hand the token back.
+                lane.bucket.tokens += 1
+                self._pump(lane)
+            raise
+
+        waited = time.monotonic() - waiter.enqueued
+        lane.waits.append(waited)
+        if self.metrics is not None:
+            self.metrics.observe("agent_ratelimit_wait_seconds", waited, model=model, kind=kind, priority=priority)
+        return waited
+
+    def _pump(self, lane: _Lane) -> None:
+        """Admit waiters while tokens are available, then schedule the next attempt."""
+        if lane.timer is not None:
+            lane.timer.cancel()
+            lane.timer = None
+
+        while lane.heap:
+            _, tag, _, waiter = lane.heap[0]
+            if waiter.future.done():
+                heapq.heappop(lane.heap)
+                continue
+
+            now = time.monotonic()
+            delay = max(lane.paused_until - now, lane.bucket.wait_time(now))
+            if delay > 0:
+                lane.timer = asyncio.get_running_loop().call_later(delay, self._pump, lane)
+                return
+
+            heapq.heappop(lane.heap)
+            lane.bucket.tokens -= 1
+            lane.clock = max(lane.clock, tag)
+            lane.admitted += 1
+            waiter.future.set_result(None)
+
+    def report_quota_error(self, model: str) -> float:
+        """Back off a model's queues after the API rejected a request for quota reasons.
+
+        Returns:
+            The pause in seconds before the next request is admitted.
+        """
+        self.quota_errors += 1
+        if self.metrics is not None:
+            self.metrics.increment("agent_quota_errors_total", model=model)
+
+        pause = 0.0
+        for kind in self.limits:
+            lane = self._lane(model, kind)
+            lane.backoff = min(self.max_backoff, max(self.min_backoff, lane.backoff * 2))
+            pause = lane.backoff * random.uniform(0.5, 1.0)
+            lane.paused_until = max(lane.paused_until, time.monotonic() + pause)
+            lane.bucket.refill(time.monotonic())
+            lane.bucket.rate = max(lane.bucket.max_rate / 64, lane.bucket.rate / 2)
+        return pause
+
+    def report_success(self, model: str) -> None:
+        """Recover a model's rates after a request went through."""
+        for kind in self.limits:
+            lane = self._lanes.get((model, kind))
+            if lane is not None and (lane.backoff or lane.bucket.rate < lane.bucket.max_rate):
+                lane.backoff = 0.0
+                lane.bucket.refill(time.monotonic())
+                lane.bucket.rate = min(lane.bucket.max_rate, lane.bucket.rate + lane.bucket.max_rate / 10)
+
+    def queue_depth(self, model: str | None = None) -> int:
+        """Number of requests waiting for admission, for one model or all of them."""
+        return sum(sum(lane.depth().values()) for (lane_model, _), lane in self._lanes.items() if model is None or lane_model == model)
+
+    def stats(self) -> dict[str, Any]:
+        """Return queue depth, wait times, admissions and current rates per model and kind."""
+        lanes = {}
+        for (model, kind), lane in self._lanes.items():
+            waits = sorted(lane.waits)
+            lanes[f"{model}/{kind}"] = {
+                "depth": lane.depth(),
+                "admitted": lane.admitted,
+                "wait_p50": waits[len(waits) // 2] if waits else 0.0,
+                "wait_max": waits[-1] if waits else 0.0,
+                "rate": lane.bucket.rate,
+                "paused_for": max(0.0, lane.paused_until - time.monotonic()),
+            }
+        return {"queue_depth": self.queue_depth(), "quota_errors": self.quota_errors, "lanes": lanes}
+
+
+class LimitedSession:
+    """Session wrapper that takes a message token from a :class:`RateLimiter` before each send."""
+
+    def __init__(self, session: live.AsyncSession, limiter: RateLimiter, model: str, priority: Priority, tenant: str) -> None:
+        """Wrap an open session."""
+        self.session = session
+        self.limiter = limiter
+        self.model = model
+        self.priority = priority
+        self.tenant = tenant
+
+    async def send(self, *, input: Any = None, end_of_turn: bool | None = False) -> None:
+        """Wait for admission, then forward a client message."""
+        await self.limiter.acquire(self.model, "message", priority=self.priority, tenant=self.tenant)
+        await self.session.send(input=input, end_of_turn=end_of_turn)
+
+    async def send_client_content(self, *, turns: Any = None, turn_complete: bool = True) -> None:
+        """Wait for admission, then forward conversation turns."""
+        await self.limiter.acquire(self.model, "message", priority=self.priority, tenant=self.tenant)
+        await self.session.send_client_content(turns=turns, turn_complete=turn_complete)
+
+    def receive(self) -> Any:
+        """Forward server messages."""
+        return self.session.receive()
+
+    async def close(self) -> None:
+        """Close the wrapped session."""
+        await self.session.close()
@@ -0,0 +1,186 @@
+"""Persistent cache of whole-task responses backed by SQLite."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires_at);
+"""
+
+
+def normalize_task(task: str) -> str:
+    """Collapse whitespace so tasks differing only in spacing share an entry."""
+    return " ".join(task.split())
+
+
+def make_task_key(
+    model: str,
+    system_instruction: str | None,
+    declarations: Iterable[dict],
+    flags: dict[str, Any],
+    task: str,
+    cacheable_tools: Iterable[str] = (),
+) -> str:
+    """Build the cache key of a task from everything that shapes its response.
+
+    Args:
+        model: The model name.
+        system_instruction: The agent's system instruction.
+        declarations: The function declarations of the agent's tools.
+        flags: Built-in tool flags such as ``enable_code_execution``.
+        task: The task text.
+        cacheable_tools: Names of the tools whose results may be cached, so agents that register
+            the same tools with different cacheability don't share entries.
+
+    Returns:
+        A hex digest that changes whenever any input, including a tool declaration, changes.
+    """
+    payload = {
+        "model": model,
+        "system_instruction": system_instruction,
+        "tools": list(declarations),
+        "flags": flags,
+        "task": normalize_task(task),
+        "cacheable_tools": sorted(cacheable_tools),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode()).hexdigest()
+
+
+class ResponseCache:
+    """SQLite file of task responses with TTL and entry/byte bounds.
+
+    Entries are keyed by :func:`make_task_key`, so changing a tool's declaration, the system
+    instruction or the model stops old entries from matching; they are then removed by TTL or
+    size eviction, least recently used first. The cache is safe to share between agents and
+    threads, and several processes may open the same file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        ttl: float = 24 * 3600.0,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        """Open or create the cache file.
+
+        Args:
+            path: The SQLite file.
+            ttl: Seconds a response stays valid.
+            max_entries: Maximum number of cached responses.
+            max_bytes: Maximum total size of cached responses.
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Number of responses currently stored, including expired ones not yet evicted."""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response for a key, or ``None`` on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response FROM responses WHERE key = ? AND expires_at > ?", (key, now)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, response: str, ttl: float | None = None) -> bool:
+        """Store a response, evicting expired then least recently used entries to stay within bounds.
+
+        Returns:
+            ``False`` if the response alone exceeds ``max_bytes`` and was not stored.
+        """
+        size = len(response.encode())
+        if size > self.max_bytes:
+            return False
+
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, response, size, expires_at, now),
+                )
+                self.evictions += self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+                self._evict_lru()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return True
+
+    def _evict_lru(self) -> None:
+        count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> dict[str, int]:
+        """Return hit, miss, bypass and eviction counters with the current size."""
+        with self._lock:
+            count, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,482 @@
+"""Travel and scheduling tools backing the example script, the benchmarks and the load generator."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from datastore import ConnectionPool
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+def get_current_weather(location: str) -> dict:
+    """Gets the current weather for a given location.
+
+    Args:
+        location: The city name (e.g., "New York")
+
+    Returns:
+        dict: Weather data including temperature, unit, and conditions
+    """
+    if "new york" in location.lower():
+        return {"temperature": 22, "unit": "Celsius", "conditions": "Partly Cloudy"}
+    elif "london" in location.lower():
+        return {"temperature": 15, "unit": "Celsius", "conditions": "Rainy"}
+    else:
+        return {"temperature": 25, "unit": "Celsius", "conditions": "Sunny"}
+
+
+def query_calendar(date: str = "today") -> dict:
+    """Retrieves user's calendar appointments for a specific date.
+
+    Args:
+        date: Date to query, can be "today", "tomorrow", or a specific date
+              (e.g., "2023-06-15"). Defaults to "today".
+
+    Returns:
+        dict: Collection of appointments with their details
+    """
+    if date == "today":
+        return {
+            "appointments": [
+                {"id": 101, "time": "09:00-10:30", "title": "Weekly Team Meeting"},
+                {"id": 102, "time": "13:00-14:00", "title": "Lunch with Client"},
+                {"id": 103, "time": "16:00-17:00", "title": "Project Review"},
+            ],
+            "date": date,
+        }
+    elif date in ["tomorrow", "2023-06-15"]:
+        return {
+            "appointments": [
+                {"id": 104, "time": "11:00-12:00", "title": "Dentist Appointment"},
+                {"id": 105, "time": "15:00-16:30", "title": "Budget Planning"},
+            ],
+            "date": date,
+        }
+    else:
+        return {"appointments": [], "date": date}
+
+
+def cancel_appointment(appointment_id: int) -> dict:
+    """Cancels a specific calendar appointment.
+
+    Args:
+        appointment_id: The unique identifier of the appointment to cancel
+
+    Returns:
+        dict: Operation status and message
+    """
+    valid_ids = [101, 102, 103, 104, 105]
+    if appointment_id in valid_ids:
+        return {"status": "success", "message": f"Appointment {appointment_id} canceled successfully"}
+    else:
+        return {"status": "error", "message": f"Appointment {appointment_id} not found"}
+
+
+def get_flight_options(origin: str, destination: str, date: str) -> dict:
+    """Retrieves available flight options between locations.
+
+    Args:
+        origin: Departure city (e.g., "San Francisco")
+        destination: Arrival city (e.g., "New York")
+        date: Travel date (e.g., "today", "2023-06-15")
+
+    Returns:
+        dict: Available flight options with details
+    """
+    flights = []
+
+    if "san francisco" in origin.lower() and "new york" in destination.lower():
+        flights = [
+            {
+                "flight_number": "AA123",
+                "origin": "SFO",
+                "destination": "JFK",
+                "departure": "08:00",
+                "arrival": "11:30",
+                "price": 349.99,
+                "airline": "American Airlines",
+            },
+            {
+                "flight_number": "DL456",
+                "origin": "SFO",
+                "destination": "LGA",
+                "departure": "10:15",
+                "arrival": "13:45",
+                "price": 425.50,
+                "airline": "Delta",
+            },
+            {
+                "flight_number": "UA789",
+                "origin": "SFO",
+                "destination": "EWR",
+                "departure": "13:45",
+                "arrival": "17:15",
+                "price": 315.75,
+                "airline": "United",
+            },
+        ]
+    elif "new york" in origin.lower() and "san francisco" in destination.lower():
+        flights = [
+            {
+                "flight_number": "AA456",
+                "origin": "JFK",
+                "destination": "SFO",
+                "departure": "09:00",
+                "arrival": "12:30",
+                "price": 379.99,
+                "airline": "American Airlines",
+            },
+            {
+                "flight_number": "DL789",
+                "origin": "LGA",
+                "destination": "SFO",
+                "departure": "11:15",
+                "arrival": "14:45",
+                "price": 405.50,
+                "airline": "Delta",
+            },
+            {
+                "flight_number": "UA321",
+                "origin": "EWR",
+                "destination": "SFO",
+                "departure": "14:45",
+                "arrival": "18:15",
+                "price": 335.75,
+                "airline": "United",
+            },
+        ]
+    elif "london" in origin.lower() and "new york" in destination.lower():
+        flights = [
+            {
+                "flight_number": "BA101",
+                "origin": "LHR",
+                "destination": "JFK",
+                "departure": "10:00",
+                "arrival": "13:00",
+                "price": 620.00,
+                "airline": "British Airways",
+            },
+            {
+                "flight_number": "VS201",
+                "origin": "LHR",
+                "destination": "JFK",
+                "departure": "12:30",
+                "arrival": "15:30",
+                "price": 580.50,
+                "airline": "Virgin Atlantic",
+            },
+        ]
+    else:
+        flights = [
+            {
+                "flight_number": "Generic",
+                "origin": origin[:3].upper(),
+                "destination": destination[:3].upper(),
+                "departure": "09:00",
+                "arrival": "11:00",
+                "price": 350.00,
+                "airline": "Generic Airlines",
+            }
+        ]
+
+    return {"flights": flights, "origin": origin, "destination": destination, "date": date}
+
+
+HOTELS = {
+    "new york": [
+        {
+            "id": 1,
+            "name": "The Grand Plaza",
+            "chain": "Marriott",
+            "brand": "JW Marriott",
+            "rating": 4.7,
+            "price_category": "luxury",
+            "price_per_night": 450,
+            "neighborhood": "Midtown",
+            "amenities": ["spa", "pool", "restaurant"],
+            "points_per_night": 50000,
+            "loyalty_program": "Marriott Bonvoy",
+        },
+        {
+            "id": 2,
+            "name": "City Lights Hotel",
+            "chain": "Hilton",
+            "brand": "DoubleTree",
+            "rating": 4.2,
+            "price_category": "moderate",
+            "price_per_night": 275,
+            "neighborhood": "Times Square",
+            "amenities": ["restaurant", "gym"],
+            "points_per_night": 70000,
+            "loyalty_program": "Hilton Honors",
+        },
+        {
+            "id": 3,
+            "name": "Riverside Inn",
+            "chain": "IHG",
+            "brand": "Holiday Inn",
+            "rating": 4.5,
+            "price_category": "moderate",
+            "price_per_night": 320,
+            "neighborhood": "Upper West Side",
+            "amenities": ["restaurant", "laundry"],
+            "points_per_night": 35000,
+            "loyalty_program": "IHG Rewards",
+        },
+        {
+            "id": 4,
+            "name": "Budget Stay",
+            "chain": "Independent",
+            "rating": 3.8,
+            "price_category": "budget",
+            "price_per_night": 150,
+            "neighborhood": "Queens",
+            "amenities": ["free wifi", "breakfast"],
+        },
+        {
+            "id": 5,
+            "name": "Luxury Towers",
+            "chain": "Marriott",
+            "brand": "The Ritz-Carlton",
+            "rating": 4.9,
+            "price_category": "luxury",
+            "price_per_night": 550,
+            "neighborhood": "Financial District",
+            "amenities": ["spa", "pool", "restaurant", "gym", "concierge"],
+            "points_per_night": 85000,
+            "loyalty_program": "Marriott Bonvoy",
+        },
+        {
+            "id": 6,
+            "name": "Hilton Midtown",
+            "chain": "Hilton",
+            "brand": "Hilton",
+            "rating": 4.6,
+            "price_category": "luxury",
+            "price_per_night": 425,
+            "neighborhood": "Midtown",
+            "amenities": ["spa", "restaurant", "gym"],
+            "points_per_night": 80000,
+            "loyalty_program": "Hilton Honors",
+        },
+        {
+            "id": 7,
+            "name": "Kimpton Hotel",
+            "chain": "IHG",
+            "brand": "Kimpton",
+            "rating": 4.4,
+            "price_category": "moderate",
+            "price_per_night": 310,
+            "neighborhood": "Chelsea",
+            "amenities": ["restaurant", "bar", "gym"],
+            "points_per_night": 40000,
+            "loyalty_program": "IHG Rewards",
+        },
+    ],
+    "london": [
+        {
+            "id": 101,
+            "name": "The Wellington",
+            "chain": "Marriott",
+            "brand": "Autograph Collection",
+            "rating": 4.6,
+            "price_category": "luxury",
+            "price_per_night": 420,
+            "amenities": ["spa", "restaurant"],
+            "points_per_night": 60000,
+            "loyalty_program": "Marriott Bonvoy",
+        },
+        {
+            "id": 102,
+            "name": "Covent Garden Hotel",
+            "chain": "Hilton",
+            "brand": "Conrad",
+            "rating": 4.3,
+            "price_category": "moderate",
+            "price_per_night": 290,
+            "amenities": ["gym", "restaurant"],
+            "points_per_night": 65000,
+            "loyalty_program": "Hilton Honors",
+        },
+    ],
+}
+
+USER_PROGRAMS = {
+    "airline_points": {"Delta SkyMiles": 47500, "United MileagePlus": 32000, "American AAdvantage": 18750},
+    "hotel_points": {"Marriott Bonvoy": 68000, "Hilton Honors": 125000, "IHG Rewards": 42000},
+    "status_levels": {"Delta": "Gold", "Marriott": "Platinum", "Hertz": "President's Circle", "Chase": "Sapphire Reserve", "Amex": "Platinum"},
+}
+
+CITY_OFFERS = {
+    "new york": [
+        {"partner": "MoMA", "discount": "20% off admission with Marriott Platinum status"},
+        {"partner": "Bergdorf Goodman", "discount": "10% off purchases with Amex Platinum"},
+        {"partner": "Citi Bike", "discount": "Free day pass with Delta Gold status"},
+        {"partner": "Empire State Building", "discount": "Priority access and 15% off admission with Chase Sapphire Reserve"},
+        {"partner": "Michelin Star Restaurants", "discount": "Priority reservations at selected restaurants with Amex Platinum"},
+        {"partner": "Broadway Shows", "discount": "25% off select shows with Marriott Platinum status"},
+        {"partner": "Metropolitan Museum of Art", "discount": "2-for-1 admission with United MileagePlus status"},
+        {"partner": "Central Park Zoo", "discount": "15% off admission with IHG Rewards membership"},
+        {"partner": "NYC Airport Express", "discount": "Free airport transfer with minimum 3-night Hilton stay"},
+    ],
+    "london": [
+        {"partner": "Harrods", "discount": "VIP shopping experience with Marriott Platinum"},
+        {"partner": "The Tube", "discount": "50% off 7-day travel card with British Airways Silver"},
+    ],
+}
+
+REDEMPTIONS = {
+    "new york": [
+        {"program": "Marriott Bonvoy", "opportunity": "Free night at JW Marriott Essex House", "points_required": 50000, "cash_value": "$650"},
+        {
+            "program": "Delta SkyMiles",
+            "opportunity": "Economy round-trip ticket (available for your dates)",
+            "points_required": 25000,
+            "cash_value": "$450",
+        },
+        {
+            "program": "Hilton Honors",
+            "opportunity": "Luxury weekend package: 1 night at Waldorf Astoria + spa treatment",
+            "points_required": 95000,
+            "cash_value": "$750",
+        },
+        {"program": "United MileagePlus", "opportunity": "VIP helicopter tour of Manhattan", "points_required": 20000, "cash_value": "$350"},
+    ],
+}
+
+
+HOTEL_COLUMNS = (
+    "id",
+    "name",
+    "chain",
+    "brand",
+    "rating",
+    "price_category",
+    "price_per_night",
+    "neighborhood",
+    "amenities",
+    "points_per_night",
+    "loyalty_program",
+)
+
+TRAVEL_SCHEMA = """
+CREATE TABLE hotels (
+    id INTEGER PRIMARY KEY,
+    city TEXT NOT NULL,
+    name TEXT NOT NULL,
+    chain TEXT NOT NULL,
+    brand TEXT,
+    rating REAL NOT NULL,
+    price_category TEXT NOT NULL,
+    price_per_night INTEGER NOT NULL,
+    neighborhood TEXT,
+    amenities TEXT NOT NULL, -- comma-separated
+    points_per_night INTEGER,
+    loyalty_program TEXT
+);
+CREATE INDEX hotels_city_rating ON hotels (city, rating);
+CREATE TABLE loyalty (category TEXT NOT NULL, name TEXT NOT NULL, value NOT NULL);
+CREATE TABLE offers (city TEXT NOT NULL, partner TEXT NOT NULL, discount TEXT NOT NULL);
+CREATE INDEX offers_city ON offers (city);
+CREATE TABLE redemptions (
+    city TEXT NOT NULL,
+    program TEXT NOT NULL,
+    opportunity TEXT NOT NULL,
+    points_required INTEGER NOT NULL,
+    cash_value TEXT NOT NULL
+);
+CREATE INDEX redemptions_city ON redemptions (city);
+"""
+
+HOTELS_SQL = f"SELECT {', '.join(HOTEL_COLUMNS)} FROM hotels WHERE city = ? ORDER BY id"
+HOTELS_MIN_RATING_SQL = f"SELECT {', '.join(HOTEL_COLUMNS)} FROM hotels WHERE city = ? AND rating >= ? ORDER BY id"
+HOTEL_CITY_SQL = "SELECT 1 FROM hotels WHERE city = ? LIMIT 1"
+LOYALTY_SQL = "SELECT category, name, value FROM loyalty ORDER BY rowid"
+OFFERS_SQL = "SELECT partner, discount FROM offers WHERE city = ? ORDER BY rowid"
+REDEMPTIONS_SQL = "SELECT program, opportunity, points_required, cash_value FROM redemptions WHERE city = ? ORDER BY rowid"
+
+
+def load_travel_data(conn: sqlite3.Connection) -> None:
+    """Create the travel tables and fill them from the reference data above."""
+    conn.executescript(TRAVEL_SCHEMA)
+    conn.executemany(
+        f"INSERT INTO hotels (city, {', '.join(HOTEL_COLUMNS)}) VALUES ({', '.join('?' * (len(HOTEL_COLUMNS) + 1))})",
+        [
+            (city, *(",".join(hotel["amenities"]) if column == "amenities" else hotel.get(column) for column in HOTEL_COLUMNS))
+            for city, hotels in HOTELS.items()
+            for hotel in hotels
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO loyalty VALUES (?, ?, ?)",
+        [(category, name, value) for category, values in USER_PROGRAMS.items() for name, value in values.items()],
+    )
+    conn.executemany(
+        "INSERT INTO offers VALUES (?, ?, ?)",
+        [(city, offer["partner"], offer["discount"]) for city, offers in CITY_OFFERS.items() for offer in offers],
+    )
+    conn.executemany(
+        "INSERT INTO redemptions VALUES (?, ?, ?, ?, ?)",
+        [
+            (city, r["program"], r["opportunity"], r["points_required"], r["cash_value"])
+            for city, redemptions in REDEMPTIONS.items()
+            for r in redemptions
+        ],
+    )
+
+
+# Loaded once per process; the tools borrow connections from any dispatch thread.
+travel_db = ConnectionPool(setup=load_travel_data)
+
+
+def query_sqlite_hotels(city: str, rating_min: str | None = None) -> dict:
+    """Queries the hotel database for accommodations matching specific criteria.
+
+    Args:
+        city: Destination city (e.g., "New York")
+        rating_min: Minimum rating value to filter hotels by (e.g., "4")
+
+    Returns:
+        dict: Matching hotels with details and counts
+    """
+    with travel_db.connection() as conn:
+        if rating_min is None:
+            rows = conn.execute(HOTELS_SQL, (city.lower(),)).fetchall()
+        else:
+            rows = conn.execute(HOTELS_MIN_RATING_SQL, (city.lower(), float(rating_min))).fetchall()
+        if not rows and conn.execute(HOTEL_CITY_SQL, (city.lower(),)).fetchone() is None:
+            return {"status": "error", "message": f"No hotel data available for {city}"}
+
+    results = []
+    for row in rows:
+        hotel = {column: value for column, value in zip(HOTEL_COLUMNS, row, strict=True) if value is not None}
+        hotel["amenities"] = hotel["amenities"].split(",")
+        results.append(hotel)
+
+    return {"status": "success", "city": city, "hotels": results, "result_count": len(results)}
+
+
+def query_loyalty_programs(destination: str | None = None) -> dict:
+    """Retrieves user's loyalty program points and eligible travel discounts.
+
+    Args:
+        destination: Optional city to filter for location-specific deals
+
+    Returns:
+        dict: Available loyalty points, status levels, and special offers
+    """
+    with travel_db.connection() as conn:
+        user_programs: dict[str, dict] = {}
+        for category, name, value in conn.execute(LOYALTY_SQL):
+            user_programs.setdefault(category, {})[name] = value
+        result = {"loyalty_programs": user_programs, "point_redemption_opportunities": []}
+
+        if destination:
+            offers = conn.execute(OFFERS_SQL, (destination.lower(),)).fetchall()
+            if offers:
+                result["destination_offers"] = [dict(offer) for offer in offers]
+            result["point_redemption_opportunities"] = [dict(r) for r in conn.execute(REDEMPTIONS_SQL, (destination.lower(),))]
+
+    return result
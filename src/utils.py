@@ -2,13 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections.abc
+import dataclasses
+import enum
 import inspect
+import re
+import types as types_module
+import typing
+import weakref
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from google.genai import types
+from executor import iterate_tool
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from google.genai import types
+
+    from executor import ToolExecutor
+    from hedging import HedgePolicy
+    from validation import ArgumentValidator
 
 # Type mapping from Python types to OpenAPI schema types
 TYPE_MAP: dict[type, str] = {
@@ -21,6 +36,54 @@ TYPE_MAP: dict[type, str] = {
 }
 
 
+class ArgumentError(ValueError):
+    """Raised when function call arguments do not match the tool signature."""
+
+    def __init__(self, tool_name: str, details: list[dict[str, str]]) -> None:
+        """Initialize with the tool name and one detail per invalid argument."""
+        self.tool_name = tool_name
+        self.details = details
+        super().__init__(f"Invalid arguments for {tool_name}: " + "; ".join(f"{d['loc']}: {d['msg']}" for d in details))
+
+    def to_response(self) -> dict:
+        """Build the structured error returned to the model."""
+        return {"error": f"Invalid arguments for {self.tool_name}", "details": self.details}
+
+
+@dataclass
+class ToolOptions:
+    """Per-tool execution options set when a tool is registered.
+
+    Attributes:
+        cpu_bound: Run the tool on a process pool instead of the thread pool.
+        cacheable: Results may be served from the agent's tool cache and identical calls
+            within one tool call are executed once.
+        cache_ttl: Seconds a cached result stays valid, or ``None`` for the cache default.
+        timeout: Seconds the tool may run before an error is returned, or ``None`` for the agent default.
+        hedge: The tool is idempotent and a second attempt may be started when the first is slow.
+        max_result_bytes: Maximum serialized size of a result sent to the model, or ``None`` for the agent default.
+        max_result_items: Maximum number of items kept in lists inside a result, or ``None`` for the agent default.
+        result_fields: Keys kept in the records (dictionaries inside lists) of a result, or ``None`` to keep all.
+        read_only: The tool has no side effects and may be run speculatively by a prefetcher.
+        streaming: The tool is a generator or async generator whose items are collected one at a
+            time, within the result limits, into a list.
+        page_items: Items per page sent to the model while a streaming tool is still running,
+            or ``None`` to send the whole result at once.
+    """
+
+    cpu_bound: bool = False
+    cacheable: bool = False
+    cache_ttl: float | None = None
+    timeout: float | None = None
+    hedge: bool = False
+    max_result_bytes: int | None = None
+    max_result_items: int | None = None
+    result_fields: tuple[str, ...] | None = None
+    read_only: bool = False
+    streaming: bool = False
+    page_items: int | None = None
+
+
 def get_python_type(annotation: type | Any) -> str:
     """Convert Python type annotations to OpenAPI schema type strings.
 
@@ -31,51 +94,200 @@ def get_python_type(annotation: type | Any) -> str:
         The corresponding OpenAPI type string.
     """
     if isinstance(annotation, type):
-        mapped_type = TYPE_MAP.get(annotation)
-        if mapped_type:
-            return mapped_type
-        for py_type, openapi_type in TYPE_MAP.items():
-            try:
-                if issubclass(annotation, py_type):
-                    return openapi_type
-            except TypeError:
-                continue
+        for base in annotation.__mro__:
+            if mapped_type := TYPE_MAP.get(base):
+                return mapped_type
     return "string"
 
 
-def parse_function(tool: Callable) -> dict:
-    """Parse a callable function into a Gemini tool declaration.
+# Compiled declarations by function object, so each tool is compiled once per process
+_DECLARATION_CACHE: weakref.WeakKeyDictionary[Callable, dict] = weakref.WeakKeyDictionary()
+
+# Google-style docstring section headers that end the "Args:" block
+_DOCSTRING_SECTIONS = ("args:", "arguments:", "parameters:", "returns:", "return:", "yields:", "raises:", "examples:", "example:", "note:", "notes:")
+
+_PARAM_LINE = re.compile(r"^(\*{0,2}\w+)\s*(?:\(([^)]*)\))?\s*:\s*(.*)$")
+
+
+def parse_docstring(docstring: str) -> tuple[str, dict[str, str]]:
+    """Split a Google-style docstring into its description and parameter descriptions.
 
     Args:
-        tool: A callable function to convert to a tool declaration.
+        docstring: A cleaned docstring, as returned by :func:`inspect.getdoc`.
 
     Returns:
-        A dictionary containing the function declaration in Gemini format.
+        The docstring without its ``Args:`` section, and the description of each documented parameter.
+    """
+    description_lines: list[str] = []
+    params: dict[str, str] = {}
+    current: str | None = None
+    in_args = False
+    args_indent = 0
 
-    Raises:
-        TypeError: If the provided tool is not a callable.
+    for line in docstring.splitlines():
+        stripped = line.strip()
+        indent = len(line) - len(line.lstrip())
+
+        if stripped.lower() in _DOCSTRING_SECTIONS and indent == 0:
+            in_args = stripped.lower() in ("args:", "arguments:", "parameters:")
+            current = None
+            args_indent = 0
+            if in_args:
+                continue
+
+        if not in_args:
+            description_lines.append(line)
+            continue
+
+        if not stripped:
+            current = None
+            continue
+
+        if not args_indent:
+            args_indent = indent
+
+        match = _PARAM_LINE.match(stripped)
+        if indent <= args_indent and match:
+            current = match.group(1).lstrip("*")
+            params[current] = match.group(3).strip()
+        elif current is not None:
+            params[current] = f"{params[current]} {stripped}".strip()
+
+    return "\n".join(description_lines).strip(), params
+
+
+def _is_typed_dict(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, dict) and hasattr(annotation, "__total__")
+
+
+def _object_schema(fields: dict[str, tuple[Any, str | None]], required: list[str], seen: frozenset[int]) -> dict:
+    properties = {}
+    for name, (annotation, description) in fields.items():
+        properties[name] = get_schema(annotation, _seen=seen)
+        if description:
+            properties[name]["description"] = description
+    schema: dict[str, Any] = {"type": "object", "properties": properties}
+    if required:
+        schema["required"] = required
+    return schema
+
+
+def get_schema(annotation: Any, *, _seen: frozenset[int] = frozenset()) -> dict:
+    """Convert a Python type annotation into an OpenAPI schema for a tool parameter.
+
+    Handles builtin scalars and containers, ``typing`` generics, ``Optional`` and unions,
+    ``Literal`` and :class:`~enum.Enum` values, dataclasses, ``TypedDict`` and Pydantic models.
+    ``Literal`` and ``Enum`` values are declared as string enums whatever their type. Anything
+    else falls back to ``string``.
+
+    Args:
+        annotation: The Python type annotation to convert.
+
+    Returns:
+        An OpenAPI schema dictionary.
     """
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return {"type": "string"}
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Annotated:
+        schema = get_schema(args[0], _seen=_seen)
+        if descriptions := [arg for arg in args[1:] if isinstance(arg, str)]:
+            schema["description"] = descriptions[0]
+        return schema
+
+    if origin is typing.Union or origin is types_module.UnionType:
+        members = [arg for arg in args if arg is not type(None)]
+        schema = get_schema(members[0], _seen=_seen) if len(members) == 1 else {"anyOf": [get_schema(member, _seen=_seen) for member in members]}
+        if len(members) < len(args):
+            schema["nullable"] = True
+        return schema
+
+    if origin is typing.Literal:
+        # The Live API only takes string enums; the validator maps the strings back to the values.
+        return {"type": "string", "enum": [str(value) for value in args]}
+
+    if origin is not None and isinstance(origin, type):
+        if issubclass(origin, dict | collections.abc.Mapping):
+            return {"type": "object"}
+        if issubclass(origin, list | tuple | set | frozenset | collections.abc.Sequence | collections.abc.Set):
+            item_args = [arg for arg in args if arg is not Ellipsis]
+            schema = {"type": "array"}
+            if item_args:
+                schema["items"] = get_schema(item_args[0], _seen=_seen)
+            return schema
+
+    if not isinstance(annotation, type):
+        return {"type": "string"}
+
+    if issubclass(annotation, enum.Enum):
+        return {"type": "string", "enum": [str(member.value) for member in annotation]}
+
+    if id(annotation) in _seen:
+        return {"type": "object"}
+    seen = _seen | {id(annotation)}
+
+    if dataclasses.is_dataclass(annotation):
+        hints = resolve_type_hints(annotation)
+        fields = {field.name: (hints.get(field.name, field.type), None) for field in dataclasses.fields(annotation)}
+        required = [
+            field.name
+            for field in dataclasses.fields(annotation)
+            if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING
+        ]
+        return _object_schema(fields, required, seen)
+
+    if _is_typed_dict(annotation):
+        hints = resolve_type_hints(annotation)
+        fields = {name: (hint, None) for name, hint in hints.items()}
+        return _object_schema(fields, sorted(annotation.__required_keys__), seen)
+
+    if model_fields := getattr(annotation, "model_fields", None):
+        fields = {name: (field.annotation, field.description) for name, field in model_fields.items()}
+        required = [name for name, field in model_fields.items() if field.is_required()]
+        return _object_schema(fields, required, seen)
+
+    schema = {"type": get_python_type(annotation)}
+    if schema["type"] == "array":
+        schema["items"] = {"type": "string"}
+    return schema
+
+
+def resolve_type_hints(obj: Any) -> dict[str, Any]:
+    """Resolve annotations, including string annotations, falling back to the raw ones."""
+    try:
+        return typing.get_type_hints(obj, include_extras=True)
+    except Exception:
+        return dict(getattr(obj, "__annotations__", {}))
+
+
+def compile_function(tool: Callable) -> dict:
+    """Compile a callable into a Gemini tool declaration without caching."""
     func_name = tool.__name__
 
     sig = inspect.signature(tool)
-    description = inspect.getdoc(tool) or f"Executes the {func_name} function."
+    hints = resolve_type_hints(tool)
+    description, param_docs = parse_docstring(inspect.getdoc(tool) or "")
 
     properties = {}
     required = []
 
     for name, param in sig.parameters.items():
-        param_type = get_python_type(param.annotation)
-        properties[name] = {
-            "type": param_type,
-            "description": f"Parameter {name}",
-        }
+        if param.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD):
+            continue
+
+        schema = get_schema(hints.get(name, param.annotation))
+        schema["description"] = param_docs.get(name) or schema.get("description") or f"Parameter {name}"
+        properties[name] = schema
 
         if param.default is inspect.Parameter.empty:
             required.append(name)
 
     declaration = {
         "name": func_name,
-        "description": description,
+        "description": description or f"Executes the {func_name} function.",
         "parameters": {
             "type": "object",
             "properties": properties,
@@ -86,8 +298,66 @@ def parse_function(tool: Callable) -> dict:
     return declaration
 
 
-def create_response(function_call: types.FunctionCall, tool_functions: dict[str, Callable]) -> types.FunctionResponse:
-    """Create a function response for a tool call."""
+def parse_function(tool: Callable) -> dict:
+    """Parse a callable function into a Gemini tool declaration.
+
+    Declarations are memoized per function object, so registering the same function with many
+    agents compiles it once. The returned dictionary is shared and must not be mutated.
+
+    Args:
+        tool: A callable function to convert to a tool declaration.
+
+    Returns:
+        A dictionary containing the function declaration in Gemini format.
+
+    Raises:
+        TypeError: If the provided tool is not a callable.
+    """
+    if not callable(tool):
+        raise TypeError(f"Tool must be callable, got {type(tool).__name__}")
+
+    try:
+        declaration = _DECLARATION_CACHE.get(tool)
+    except TypeError:
+        return compile_function(tool)
+
+    if declaration is None:
+        declaration = compile_function(tool)
+        _DECLARATION_CACHE[tool] = declaration
+
+    return declaration
+
+
+async def create_response(
+    function_call: types.FunctionCall,
+    tool_functions: dict[str, Callable],
+    executor: ToolExecutor | None = None,
+    options: ToolOptions | None = None,
+    validator: ArgumentValidator | None = None,
+    timeout: float | None = None,
+    hedge_policy: HedgePolicy | None = None,
+    collect: Callable[[AsyncIterator[Any]], Awaitable[Any]] | None = None,
+) -> types.FunctionResponse:
+    """Create a function response for a tool call.
+
+    Args:
+        function_call: The function call issued by the model.
+        tool_functions: Registered tools by name.
+        executor: Executor that runs the tool off the event loop. Without one, ``async def``
+            tools are awaited and synchronous tools run via :func:`asyncio.to_thread`.
+        options: Execution options for the called tool.
+        validator: Validator that coerces the arguments before dispatch. Invalid arguments
+            produce a structured error response without calling the tool.
+        timeout: Seconds the tool may run before it is cancelled and an error is returned.
+        hedge_policy: Policy used to hedge the call when ``options.hedge`` is set.
+        collect: Consumes the items of a streaming tool and returns the result. Defaults to
+            collecting every item into a list.
+
+    Returns:
+        The function response carrying the tool result or error.
+    """
+    from google.genai import types
+
     if function_call.name not in tool_functions:
         return types.FunctionResponse(
             name=function_call.name,
@@ -95,8 +365,35 @@ def create_response(function_call: types.FunctionCall, tool_functions: dict[str,
             response={"error": f"Function {function_call.name} not implemented by agent"},
         )
 
+    tool = tool_functions[function_call.name]
+    args = function_call.args or {}
+    cpu_bound = options.cpu_bound if options else False
+
+    async def attempt() -> Any:
+        if options is not None and options.streaming:
+            batch = options.page_items or 64
+            items = executor.iterate(tool, args, batch=batch) if executor is not None else iterate_tool(tool, args, batch=batch)
+            if collect is not None:
+                return await collect(items)
+            return [item async for item in items]
+        if executor is not None:
+            return await executor.call(tool, args, cpu_bound=cpu_bound)
+        if inspect.iscoroutinefunction(tool):
+            return await tool(**args)
+        return await asyncio.to_thread(tool, **args)
+
+    deadline = asyncio.timeout(timeout)
     try:
-        result = tool_functions[function_call.name](**function_call.args)
+        if validator is not None:
+            args = validator.validate(args)
+        async with deadline:
+            if hedge_policy is not None and options is not None and options.hedge:
+                result = await hedge_policy.run(function_call.name, attempt)
+            else:
+                result = await attempt()
         return types.FunctionResponse(name=function_call.name, id=function_call.id, response={"result": result})
+    except ArgumentError as e:
+        return types.FunctionResponse(name=function_call.name, id=function_call.id, response=e.to_response())
     except Exception as e:
-        return types.FunctionResponse(name=function_call.name, id=function_call.id, response={"error": str(e)})
+        error = f"Function {function_call.name} timed out after {timeout:g}s" if deadline.expired() else str(e)
+        return types.FunctionResponse(name=function_call.name, id=function_call.id, response={"error": error})
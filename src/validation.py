@@ -0,0 +1,249 @@
+"""Argument validation and coercion for tool calls."""
+
+from __future__ import annotations
+
+import enum
+import inspect
+import logging
+import types as types_module
+import typing
+import weakref
+from typing import TYPE_CHECKING, Any
+
+from utils import ArgumentError, resolve_type_hints
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import pydantic
+
+logger = logging.getLogger(__name__)
+
+
+def _coerce_str(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(int(value)) if isinstance(value, float) and value.is_integer() else str(value)
+    raise ValueError("Input should be a valid string")
+
+
+def _coerce_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError("Input should be a valid integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise ValueError("Input should be a valid integer")
+
+
+def _coerce_float(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            pass
+    raise ValueError("Input should be a valid number")
+
+
+def _coerce_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    if value in (0, 1):
+        return bool(value)
+    raise ValueError("Input should be a valid boolean")
+
+
+def _passthrough(value: Any) -> Any:
+    return value
+
+
+def _choices(annotation: Any) -> dict[str, Any] | None:
+    """Map the strings a ``Literal`` or ``Enum`` annotation is declared with back to its values."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Annotated:
+        return _choices(args[0])
+    if origin is typing.Union or origin is types_module.UnionType:
+        members = [arg for arg in args if arg is not type(None)]
+        return _choices(members[0]) if len(members) == 1 else None
+    if origin is typing.Literal:
+        return {str(value): value for value in args}
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        return {str(member.value): member for member in annotation}
+    return None
+
+
+# Coercers for the scalar annotations handled without Pydantic
+_FAST_COERCERS: dict[Any, Callable[[Any], Any]] = {
+    str: _coerce_str,
+    int: _coerce_int,
+    float: _coerce_float,
+    bool: _coerce_bool,
+    Any: _passthrough,
+    inspect.Parameter.empty: _passthrough,
+}
+
+
+class ArgumentValidator:
+    """Validates and coerces function call arguments against a tool signature.
+
+    Built once per tool. Signatures made only of ``str``, ``int``, ``float``, ``bool`` and
+    unannotated parameters use a hand-built fast path; anything else goes through a Pydantic
+    model compiled from the signature, in which a parameter whose annotation Pydantic rejects is
+    passed through unchecked. JSON numbers are coerced to the annotated type, so an
+    ``int`` parameter receives ``101`` rather than ``101.0``, and the strings ``Literal`` and
+    ``Enum`` parameters are declared with are turned back into their values.
+    """
+
+    def __init__(self, tool: Callable) -> None:
+        """Compile a validator for a tool's signature."""
+        self.tool_name = tool.__name__
+        sig = inspect.signature(tool)
+        hints = resolve_type_hints(tool)
+
+        self.accepts_extra = any(param.kind is inspect.Parameter.VAR_KEYWORD for param in sig.parameters.values())
+        params = {
+            name: param
+            for name, param in sig.parameters.items()
+            if param.kind not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        }
+        annotations = {name: hints.get(name, param.annotation) for name, param in params.items()}
+        self.required = frozenset(name for name, param in params.items() if param.default is inspect.Parameter.empty)
+        self.nullable = frozenset(name for name, param in params.items() if param.default is None)
+        self.choices = {name: choices for name, annotation in annotations.items() if (choices := _choices(annotation)) is not None}
+
+        self._coercers: dict[str, Callable[[Any], Any]] | None = None
+        self._model: type[pydantic.BaseModel] | None = None
+
+        if all(_is_fast(annotation) for annotation in annotations.values()):
+            self._coercers = {name: _FAST_COERCERS[annotation] for name, annotation in annotations.items()}
+        else:
+            import pydantic
+
+            fields = {
+                name: (
+                    Any if annotation is inspect.Parameter.empty else annotation,
+                    ... if param.default is inspect.Parameter.empty else param.default,
+                )
+                for (name, param), annotation in zip(params.items(), annotations.values(), strict=True)
+            }
+            config = pydantic.ConfigDict(
+                extra="allow" if self.accepts_extra else "forbid",
+                coerce_numbers_to_str=True,
+                arbitrary_types_allowed=True,
+            )
+            try:
+                self._model = pydantic.create_model(f"{self.tool_name}_args", __config__=config, **fields)
+            except pydantic.PydanticUserError:
+                # Such as a typing.TypedDict parameter before Python 3.12: relax only the rejected fields
+                rejected = [name for name, field in fields.items() if not _accepts_field(name, field, config)]
+                logger.warning("Cannot validate %s of tool %s, passing them through unchecked", ", ".join(rejected), self.tool_name)
+                fields.update({name: (Any, fields[name][1]) for name in rejected})
+                self._model = pydantic.create_model(f"{self.tool_name}_args", __config__=config, **fields)
+
+    @property
+    def is_fast(self) -> bool:
+        """Whether the validator uses the hand-built fast path."""
+        return self._coercers is not None
+
+    def validate(self, args: dict[str, Any] | None) -> dict[str, Any]:
+        """Validate and coerce arguments.
+
+        Args:
+            args: The function call arguments sent by the model.
+
+        Returns:
+            The coerced keyword arguments to call the tool with.
+
+        Raises:
+            ArgumentError: If any argument is missing, unexpected or of the wrong type.
+        """
+        args = args or {}
+        if self.choices:
+            choices = self.choices
+            args = {name: choices[name].get(value, value) if isinstance(value, str) and name in choices else value for name, value in args.items()}
+
+        if self._model is not None:
+            import pydantic
+
+            try:
+                model = self._model.model_validate(args)
+            except pydantic.ValidationError as e:
+                details = [{"loc": ".".join(str(part) for part in error["loc"]), "msg": error["msg"], "type": error["type"]} for error in e.errors()]
+                raise ArgumentError(self.tool_name, details) from None
+            coerced = {name: getattr(model, name) for name in args if name in self._model.model_fields}
+            if model.model_extra:
+                coerced.update(model.model_extra)
+            return coerced
+
+        coerced = {}
+        details = []
+        for name, value in args.items():
+            coercer = self._coercers.get(name)
+            if coercer is None:
+                if self.accepts_extra:
+                    coerced[name] = value
+                else:
+                    details.append({"loc": name, "msg": "Unexpected argument", "type": "extra_forbidden"})
+                continue
+            if value is None and name in self.nullable:
+                coerced[name] = None
+                continue
+            try:
+                coerced[name] = coercer(value)
+            except ValueError as e:
+                details.append({"loc": name, "msg": str(e), "type": "type_error"})
+
+        if not self.required <= args.keys():
+            details.extend({"loc": name, "msg": "Field required", "type": "missing"} for name in sorted(self.required - args.keys()))
+
+        if details:
+            raise ArgumentError(self.tool_name, details)
+        return coerced
+
+
+def _accepts_field(name: str, field: tuple[Any, Any], config: pydantic.ConfigDict) -> bool:
+    """Whether Pydantic can build a model holding only this field."""
+    import pydantic
+
+    try:
+        pydantic.create_model("probe", __config__=config, **{name: field})
+    except pydantic.PydanticUserError:
+        return False
+    return True
+
+
+def _is_fast(annotation: Any) -> bool:
+    try:
+        return annotation in _FAST_COERCERS
+    except TypeError:
+        return False
+
+
+# Compiled validators by function object, so each tool is compiled once per process
+_VALIDATOR_CACHE: weakref.WeakKeyDictionary[Callable, ArgumentValidator] = weakref.WeakKeyDictionary()
+
+
+def build_validator(tool: Callable) -> ArgumentValidator:
+    """Return the argument validator for a tool, compiling it on first use."""
+    try:
+        validator = _VALIDATOR_CACHE.get(tool)
+    except TypeError:
+        return ArgumentValidator(tool)
+
+    if validator is None:
+        validator = ArgumentValidator(tool)
+        _VALIDATOR_CACHE[tool] = validator
+
+    return validator
@@ -0,0 +1,359 @@
+"""Multi-process worker pool that shards tasks across agents running in separate processes."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from agent import TaskResult
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable
+    from multiprocessing.connection import Connection
+
+    from agent import Agent
+    from events import Event
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerError(RuntimeError):
+    """A worker process died or was stopped while it still had tasks in flight."""
+
+
+def _resolve_factory(factory: Callable[[], Agent] | str) -> Callable[[], Agent]:
+    if not isinstance(factory, str):
+        return factory
+    module_name, sep, attr = factory.partition(":")
+    if not sep or not module_name or not attr:
+        raise ValueError(f"Agent factory must be given as module:function, got {factory!r}")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _read_into_loop(conn: Connection, loop: asyncio.AbstractEventLoop, deliver: Callable[[Any], None]) -> None:
+    """Forward messages from a pipe to a handler on the event loop until the pipe closes."""
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            message = None
+        try:
+            loop.call_soon_threadsafe(deliver, message)
+        except RuntimeError:
+            return
+        if message is None:
+            return
+
+
+def _worker_main(factory: Callable[[], Agent] | str, conn: Connection, heartbeat_interval: float) -> None:
+    """Entry point of a worker process."""
+    asyncio.run(_serve(factory, conn, heartbeat_interval))
+
+
+async def _serve(factory: Callable[[], Agent] | str, conn: Connection, heartbeat_interval: float) -> None:
+    """Run tasks received over the pipe on this process's own agent until told to drain."""
+    agent = _resolve_factory(factory)()
+    loop = asyncio.get_running_loop()
+    inbox: asyncio.Queue[Any] = asyncio.Queue()
+    threading.Thread(target=_read_into_loop, args=(conn, loop, inbox.put_nowait), daemon=True).start()
+
+    tasks: dict[int, asyncio.Task] = {}
+    stats = {"completed": 0, "errors": 0, "loop_lag": 0.0}
+
+    async def handle(task_id: int, kind: str, task: str, options: dict) -> None:
+        try:
+            if kind == "stream":
+                async for event in agent.stream(task, **options):
+                    conn.send(("event", task_id, event))
+                conn.send(("result", task_id, None, None))
+            else:
+                conn.send(("result", task_id, await agent.run(task, raise_errors=True, **options), None))
+        except asyncio.CancelledError:
+            conn.send(("result", task_id, None, "Cancelled"))
+        except Exception as e:
+            stats["errors"] += 1
+            conn.send(("result", task_id, None, str(e) or type(e).__name__))
+        finally:
+            stats["completed"] += 1
+            tasks.pop(task_id, None)
+
+    async def heartbeat() -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(heartbeat_interval)
+            stats["loop_lag"] = max(0.0, time.perf_counter() - started - heartbeat_interval)
+            conn.send(("health", {"inflight": len(tasks), **stats}))
+
+    conn.send(("ready", os.getpid()))
+    beat = asyncio.create_task(heartbeat())
+    try:
+        while (message := await inbox.get()) is not None:
+            kind = message[0]
+            if kind in ("run", "stream"):
+                _, task_id, task, options = message
+                tasks[task_id] = asyncio.create_task(handle(task_id, kind, task, options))
+            elif kind == "cancel" and (running := tasks.get(message[1])):
+                running.cancel()
+            elif kind == "drain":
+                break
+
+        if tasks:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+    finally:
+        beat.cancel()
+        await agent.close()
+        with contextlib.suppress(OSError):
+            conn.send(("drained", stats["completed"]))
+            conn.close()
+
+
+class _Worker:
+    """Front-process handle of one worker process."""
+
+    def __init__(self, index: int, process: multiprocessing.process.BaseProcess, conn: Connection) -> None:
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.inflight: dict[int, asyncio.Queue] = {}
+        self.ready: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self.drained: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self.health: dict[str, Any] = {}
+        self.last_seen = time.monotonic()
+        self.dispatched = 0
+        self.alive = True
+
+
+class WorkerPool:
+    """Distributes tasks over worker processes, each with its own event loop and :class:`~agent.Agent`.
+
+    Every worker builds its agent with ``factory``, so tools, session pool and caches are per
+    process. Tasks go to the live worker with the fewest tasks in flight. Results and streamed
+    events are relayed back over a pipe. Workers send heartbeats with their load and event loop
+    lag, which :meth:`health` reports. :meth:`drain` stops accepting tasks and waits for the
+    in-flight ones before the workers exit. Tasks on a worker that dies fail with :class:`WorkerError`.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Agent] | str,
+        *,
+        workers: int | None = None,
+        heartbeat_interval: float = 1.0,
+        heartbeat_timeout: float = 10.0,
+        start_method: str = "spawn",
+    ) -> None:
+        """Initialize the pool; workers are started by :meth:`start` or ``async with``.
+
+        Args:
+            factory: Builds the agent in each worker. It must be picklable, such as a module-level
+                function, or given as a ``module:function`` string.
+            workers: Number of worker processes. Defaults to the CPU count.
+            heartbeat_interval: Seconds between worker heartbeats.
+            heartbeat_timeout: Seconds without a heartbeat after which a worker is reported unhealthy.
+            start_method: :mod:`multiprocessing` start method for the workers.
+        """
+        self.factory = factory
+        self.size = workers or os.cpu_count() or 1
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.context = multiprocessing.get_context(start_method)
+        self._workers: list[_Worker] = []
+        self._ids = itertools.count()
+        self._accepting = False
+
+    async def __aenter__(self) -> WorkerPool:
+        """Start the workers."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Drain and stop the workers."""
+        await self.drain()
+
+    async def start(self) -> None:
+        """Start the worker processes and wait until each has built its agent."""
+        loop = asyncio.get_running_loop()
+        for index in range(self.size):
+            parent, child = self.context.Pipe()
+            process = self.context.Process(
+                target=_worker_main,
+                args=(self.factory, child, self.heartbeat_interval),
+                name=f"agent-worker-{index}",
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            worker = _Worker(index, process, parent)
+            self._workers.append(worker)
+            threading.Thread(
+                target=_read_into_loop, args=(parent, loop, lambda message, worker=worker: self._deliver(worker, message)), daemon=True
+            ).start()
+
+        try:
+            await asyncio.gather(*(worker.ready for worker in self._workers))
+        except BaseException:
+            await self.drain(timeout=1.0)
+            raise
+        self._accepting = True
+
+    def _deliver(self, worker: _Worker, message: Any) -> None:
+        """Route a message from a worker to the caller waiting on it."""
+        worker.last_seen = time.monotonic()
+        if message is None:
+            self._lost(worker)
+            return
+
+        kind = message[0]
+        if kind in ("event", "result"):
+            queue = worker.inflight.get(message[1])
+            if queue is not None:
+                queue.put_nowait(message)
+                if kind == "result":
+                    del worker.inflight[message[1]]
+        elif kind == "health":
+            worker.health = message[1]
+        elif kind == "ready" and not worker.ready.done():
+            worker.ready.set_result(message[1])
+        elif kind == "drained" and not worker.drained.done():
+            worker.drained.set_result(message[1])
+
+    def _lost(self, worker: _Worker) -> None:
+        """Fail the tasks of a worker whose pipe closed."""
+        worker.alive = False
+        for task_id, queue in worker.inflight.items():
+            queue.put_nowait(("result", task_id, None, f"Worker {worker.index} exited"))
+        worker.inflight.clear()
+        for future in (worker.ready, worker.drained):
+            if not future.done():
+                future.set_exception(WorkerError(f"Worker {worker.index} exited"))
+                # Mark retrieved so an unawaited failure isn't logged.
+                future.exception()
+        if self._accepting:
+            logger.warning("Agent worker %d (pid %s) exited", worker.index, worker.process.pid)
+
+    def _pick(self) -> _Worker:
+        if not self._accepting:
+            raise RuntimeError("Worker pool is not accepting tasks")
+        live = [worker for worker in self._workers if worker.alive]
+        if not live:
+            raise WorkerError("No live workers")
+        return min(live, key=lambda worker: len(worker.inflight))
+
+    async def _submit(self, kind: str, task: str, options: dict) -> AsyncIterator[tuple]:
+        worker = self._pick()
+        task_id = next(self._ids)
+        queue: asyncio.Queue[tuple] = asyncio.Queue()
+        worker.inflight[task_id] = queue
+        worker.dispatched += 1
+        try:
+            worker.conn.send((kind, task_id, task, options))
+        except OSError as e:
+            worker.inflight.pop(task_id, None)
+            raise WorkerError(f"Worker {worker.index} is unreachable") from e
+
+        finished = False
+        try:
+            while True:
+                message = await queue.get()
+                if message[0] == "result":
+                    finished = True
+                yield message
+                if finished:
+                    return
+        finally:
+            if not finished and worker.alive:
+                with contextlib.suppress(OSError):
+                    worker.conn.send(("cancel", task_id))
+
+    async def stream(self, task: str, **options: Any) -> AsyncIterator[Event]:
+        """Run a task on a worker and yield the events it relays, like :meth:`agent.Agent.stream`.
+
+        Raises:
+            WorkerError: If the task failed or its worker exited.
+        """
+        async for message in self._submit("stream", task, options):
+            if message[0] == "event":
+                yield message[2]
+            elif message[3] is not None:
+                raise WorkerError(message[3])
+
+    async def run(self, task: str, **options: Any) -> str:
+        """Run a task on a worker and return its response, or ``"Error: ..."`` like :meth:`agent.Agent.run`."""
+        result = await self._result(task, options)
+        return result.response if result.ok else f"Error: {result.error}"
+
+    async def _result(self, task: str, options: dict) -> TaskResult:
+        try:
+            async for message in self._submit("run", task, options):
+                if message[0] == "result":
+                    return TaskResult(task, response=message[2], error=message[3])
+        except WorkerError as e:
+            return TaskResult(task, error=str(e))
+        return TaskResult(task, error="No result")
+
+    async def run_many(self, tasks: Iterable[str], *, concurrency: int = 64, **options: Any) -> list[TaskResult]:
+        """Run tasks across the workers and return one result per task, in input order.
+
+        Args:
+            tasks: The tasks to run.
+            concurrency: Maximum number of tasks in flight across all workers.
+            **options: Keyword arguments for :meth:`agent.Agent.run`, such as ``enable_google_search``.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_one(task: str) -> TaskResult:
+            async with semaphore:
+                return await self._result(task, options)
+
+        return list(await asyncio.gather(*(run_one(task) for task in tasks)))
+
+    def health(self) -> list[dict[str, Any]]:
+        """Return the liveness, load and last reported stats of every worker."""
+        now = time.monotonic()
+        report = []
+        for worker in self._workers:
+            silent_for = now - worker.last_seen
+            report.append(
+                {
+                    "worker": worker.index,
+                    "pid": worker.process.pid,
+                    "alive": worker.alive and worker.process.is_alive(),
+                    "healthy": worker.alive and silent_for < self.heartbeat_timeout,
+                    "inflight": len(worker.inflight),
+                    "dispatched": worker.dispatched,
+                    "last_heartbeat": silent_for,
+                    **worker.health,
+                }
+            )
+        return report
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """Stop accepting tasks, let in-flight tasks finish and stop the workers.
+
+        Workers still running after ``timeout`` seconds are terminated and their tasks fail.
+        """
+        self._accepting = False
+        for worker in self._workers:
+            if worker.alive:
+                with contextlib.suppress(OSError):
+                    worker.conn.send(("drain",))
+
+        pending = [worker.drained for worker in self._workers if worker.alive]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+
+        for worker in self._workers:
+            await asyncio.to_thread(worker.process.join, 5.0 if worker.drained.done() else 0)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                await asyncio.to_thread(worker.process.join)
+            worker.conn.close()
+        self._workers.clear()